@@ -0,0 +1 @@
+"""Benchmark Mila offline, against local stand-ins for its APIs."""
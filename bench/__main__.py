@@ -0,0 +1,270 @@
+"""Benchmark Mila end to end against local fakes.
+
+Run from the repository root with ``python -m bench``. The fake
+Assistants API and tool APIs run in a child process; MilaBot runs here,
+fed by a fake Discord, with its default configuration apart from the
+endpoints. For each number of concurrent conversations, it reports
+throughput, end-to-end latency, calls per message and memory growth.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from collections import Counter
+
+import aiohttp
+
+from bench import fakes
+
+ROUNDS = {
+    "none": [],
+    "weather": [("get_weather", {"zipcode": "10001"})],
+    "horoscope": [("get_horoscope", {"star_sign": "leo"})],
+    "meme": [
+        ("get_meme_templates", {}),
+        ("get_meme", {"template_id": 100001, "text0": "a", "text1": "b"}),
+    ],
+    "scrape": [("scrape_url", {"url": "{tools}/page"})],
+}
+
+
+def _arguments() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Numbers of concurrent conversations to run.",
+    )
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=1,
+        help="Messages sent, one after another, in each conversation.",
+    )
+    parser.add_argument(
+        "--run-duration",
+        type=float,
+        default=0.5,
+        help="Seconds each fake run takes.",
+    )
+    parser.add_argument(
+        "--tools",
+        choices=sorted(ROUNDS),
+        nargs="+",
+        default=["weather"],
+        help="Tool rounds each fake run requires, in order.",
+    )
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON."
+    )
+    return parser.parse_args()
+
+
+def _rss() -> int:
+    """Get the resident memory of this process, in KiB."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def _calls(session: aiohttp.ClientSession, url: str) -> Counter:
+    """Get the calls a fake has counted."""
+    async with session.get(f"{url}/_calls") as response:
+        return Counter(await response.json())
+
+
+async def _wait_for(session: aiohttp.ClientSession, url: str) -> None:
+    """Wait for a fake to come up."""
+    for _ in range(100):
+        try:
+            await _calls(session, url)
+            return
+        except aiohttp.ClientError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Fake at {url} never came up.")
+
+
+async def _counts(session: aiohttp.ClientSession, chat, urls: dict) -> dict:
+    """Get the calls made so far to each fake."""
+    return {
+        "openai": await _calls(session, urls["openai"]),
+        "tools": await _calls(session, urls["tools"]),
+        "discord": Counter(chat.calls),
+    }
+
+
+def _latencies(results: list) -> dict:
+    """Summarize answer latencies, setting aside shed messages."""
+    # pylint: disable=import-outside-toplevel
+    from mila import config
+    from mila.metrics import Histogram
+
+    answers = [answer for turns in results for answer in turns]
+    latencies = Histogram(samples=len(answers))
+    for latency, answer in answers:
+        if answer != config.OVERLOADED_REPLY:
+            latencies.observe(latency)
+    return {
+        "shed": len(answers) - latencies.count,
+        "latency_ms": {
+            f"p{round(quantile * 100)}": round(value * 1000, 1)
+            for quantile, value in latencies.quantiles().items()
+        },
+    }
+
+
+async def _round(bot, chat, size: int, messages: int, urls: dict) -> dict:
+    """Run one round of concurrent conversations."""
+
+    async def conversation(channel) -> list:
+        """Send a conversation's messages, one after another."""
+        return [
+            await chat.converse(channel, f"Message {number}.")
+            for number in range(messages)
+        ]
+
+    async with aiohttp.ClientSession() as session:
+        before = await _counts(session, chat, urls)
+        rss, elapsed = _rss(), time.monotonic()
+        results = await asyncio.gather(
+            *(conversation(channel) for channel in chat.channels(size))
+        )
+        rss, elapsed = _rss() - rss, time.monotonic() - elapsed
+        after = await _counts(session, chat, urls)
+    calls = {name: after[name] - before[name] for name in after}
+    total = size * messages
+    return {
+        "conversations": size,
+        "messages": total,
+        **_latencies(results),
+        "seconds": round(elapsed, 3),
+        "messages_per_second": round(total / elapsed, 2),
+        **{
+            f"{name}_calls_per_message": round(sum(counts.values()) / total, 2)
+            for name, counts in calls.items()
+        },
+        "openai_calls": dict(calls["openai"]),
+        "rss_growth_kib": rss,
+        "stats": bot._mila.stats(),  # pylint: disable=protected-access
+    }
+
+
+async def _bench(arguments: argparse.Namespace, urls: dict) -> list:
+    """Run every round against one long-lived bot."""
+    # Mila reads its OpenAI endpoint and keys when it connects.
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": "bench",
+            "OPENAI_BASE_URL": f"{urls['openai']}/v1",
+            "OPENWEATHERMAP_API_KEY": "bench",
+            "SERPAPI_API_KEY": "bench",
+            "IMGFLIP_USERNAME": "bench",
+            "IMGFLIP_PASSWORD": "bench",
+        }
+    )
+    # pylint: disable=import-outside-toplevel
+    import discord
+
+    from bench.chat import FakeDiscord
+    from mila import Mila, config
+    from mila.logging import LOGGER
+    from milabot import MilaBot
+
+    LOGGER.setLevel("WARNING")
+    config.ASSISTANT_CACHE = os.path.join(tempfile.mkdtemp(), "assistant.json")
+    config.METRICS_PORT = 0
+    config.HOROSCOPE_URL = f"{urls['tools']}/horoscope"
+    config.IMGFLIP_URL = f"{urls['tools']}/imgflip"
+    config.WEATHER_URL = f"{urls['tools']}/weather"
+    config.SEARCH_URL = f"{urls['tools']}/search"
+
+    async with aiohttp.ClientSession() as session:
+        for url in urls.values():
+            await _wait_for(session, url)
+    bot = MilaBot(mila=Mila(), intents=discord.Intents.default())
+    chat = FakeDiscord(bot)
+    results = []
+    try:
+        await bot.setup_hook()
+        for size in arguments.sizes:
+            results.append(
+                await _round(bot, chat, size, arguments.messages, urls)
+            )
+    finally:
+        await bot.close()
+    return results
+
+
+def _report(results: list) -> None:
+    """Print the results as a table."""
+    print(
+        f"{'convs':>6} {'msgs/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+        f" {'p99 ms':>8} {'shed':>5} {'openai/msg':>10}"
+        f" {'tools/msg':>9} {'discord/msg':>11} {'rss +KiB':>9}"
+    )
+    for result in results:
+        latency = result["latency_ms"]
+        print(
+            f"{result['conversations']:>6}"
+            f" {result['messages_per_second']:>8}"
+            f" {latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8}"
+            f" {result['shed']:>5}"
+            f" {result['openai_calls_per_message']:>10}"
+            f" {result['tools_calls_per_message']:>9}"
+            f" {result['discord_calls_per_message']:>11}"
+            f" {result['rss_growth_kib']:>9}"
+        )
+
+
+def main() -> None:
+    """Start the fakes, run the benchmark and report."""
+    arguments = _arguments()
+    urls = {
+        "openai": f"http://127.0.0.1:{arguments.port}",
+        "tools": f"http://127.0.0.1:{arguments.port + 1}",
+    }
+    actions = [
+        (
+            name,
+            {
+                key: (
+                    value.format(tools=urls["tools"])
+                    if isinstance(value, str)
+                    else value
+                )
+                for key, value in tool_arguments.items()
+            },
+        )
+        for tools in arguments.tools
+        for name, tool_arguments in ROUNDS[tools]
+    ]
+    server = multiprocessing.Process(
+        target=fakes.serve,
+        args=(arguments.port, arguments.run_duration, actions),
+        daemon=True,
+    )
+    server.start()
+    try:
+        results = asyncio.run(_bench(arguments, urls))
+    finally:
+        server.terminate()
+    if arguments.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _report(results)
+
+
+if __name__ == "__main__":
+    main()
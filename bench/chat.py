@@ -0,0 +1,141 @@
+"""Provide a fake Discord that feeds messages to MilaBot."""
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+
+import discord
+
+_IDS = itertools.count(1)
+
+
+class FakeUser:
+    """Stand in for a Discord user."""
+
+    def __init__(self, name: str, bot: bool = False):
+        """Initialize the user."""
+        self.id = next(_IDS)
+        self.name = name
+        self.bot = bot
+
+    def mentioned_in(self, message) -> bool:
+        """Check whether a message mentions the user."""
+        return self in message.mentions
+
+
+class FakeGuild:
+    """Stand in for a Discord server."""
+
+    def __init__(self, name: str):
+        """Initialize the guild."""
+        self.id = next(_IDS)
+        self.name = name
+
+    def get_role(self, _role_id: int):
+        """Find no roles."""
+        return None
+
+
+class FakeChannel:
+    """Stand in for a Discord text channel with some earlier chatter."""
+
+    def __init__(self, discord_: "FakeDiscord", guild: FakeGuild):
+        """Initialize the channel."""
+        self.id = next(_IDS)
+        self.guild = guild
+        self.type = discord.ChannelType.text
+        self.discord = discord_
+
+    async def history(self, limit: int):
+        """Yield earlier messages, newest first."""
+        self.discord.calls["history"] += 1
+        author = FakeUser("regular")
+        for number in range(limit):
+            yield FakeMessage(self, author, f"Earlier message {number}.")
+
+
+class FakeMessage:
+    """Stand in for a Discord message, recording what is done to it."""
+
+    def __init__(
+        self,
+        channel: FakeChannel,
+        author: FakeUser,
+        content: str,
+        mentions: list = None,
+        reply_to: "FakeMessage" = None,
+    ):
+        """Initialize the message."""
+        self.id = next(_IDS)
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.mentions = mentions or []
+        self._reply_to = reply_to
+
+    @property
+    def guild(self) -> FakeGuild:
+        """Get the message's guild."""
+        return self.channel.guild
+
+    async def reply(self, content: str) -> "FakeMessage":
+        """Reply to the message."""
+        self.channel.discord.calls["reply"] += 1
+        return FakeMessage(
+            self.channel,
+            self.channel.discord.bot_user,
+            content,
+            reply_to=self,
+        )
+
+    async def edit(self, content: str) -> "FakeMessage":
+        """Edit the message; the first edit of a placeholder answers."""
+        self.channel.discord.calls["edit"] += 1
+        self.content = content
+        if self._reply_to is not None:
+            self.channel.discord.answered(self._reply_to, content)
+        return self
+
+
+class FakeDiscord:
+    """Drive MilaBot with conversations and time its answers."""
+
+    def __init__(self, bot: discord.Client):
+        """Initialize the fake Discord and sign the bot in."""
+        self.bot_user = FakeUser("Mila", bot=True)
+        self.calls = Counter()
+        self._bot = bot
+        # pylint: disable-next=protected-access
+        bot._connection.user = self.bot_user
+        self._sent = {}
+        self._answered = {}
+
+    def answered(self, message: FakeMessage, content: str) -> None:
+        """Record when, and how, a message was first answered."""
+        if message.id in self._sent and message.id not in self._answered:
+            self._answered[message.id] = time.monotonic()
+            self._sent[message.id][1].set_result(content)
+
+    async def converse(self, channel: FakeChannel, text: str) -> tuple:
+        """Send a mention to the bot and await (latency, answer)."""
+        user = FakeUser("user")
+        message = FakeMessage(
+            channel,
+            user,
+            f"<@{self.bot_user.id}> {text}",
+            mentions=[self.bot_user],
+        )
+        answer = asyncio.get_running_loop().create_future()
+        self._sent[message.id] = (time.monotonic(), answer)
+        await self._bot.on_message(message)
+        content = await answer
+        sent, _ = self._sent.pop(message.id)
+        return self._answered.pop(message.id) - sent, content
+
+    def channels(self, count: int) -> list:
+        """Open a channel, in a guild of its own, per conversation."""
+        return [
+            FakeChannel(self, FakeGuild(f"Guild {number}"))
+            for number in range(count)
+        ]
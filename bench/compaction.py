@@ -0,0 +1,97 @@
+"""Measure how many tokens compacting each tool's output saves.
+
+Run from the repository root with ``python -m bench.compaction``. Each
+tool is called once, through Mila's own toolset, against the local fake
+tool APIs; its output is counted before and after compaction.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+from aiohttp import web
+
+from bench.fakes import FakeTools
+
+CALLS = {
+    "get_weather": {"zipcode": "10001"},
+    "get_horoscope": {"star_sign": "leo"},
+    "get_meme_templates": {},
+    "search_duckduckgo": {"query": "mila"},
+    "scrape_url": {"url": "{tools}/page"},
+}
+
+
+def _arguments() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON."
+    )
+    return parser.parse_args()
+
+
+async def _measure(port: int) -> dict:
+    """Call each tool against the fakes; get the compaction counters."""
+    # pylint: disable=import-outside-toplevel
+    from mila import config
+    from mila.logging import LOGGER
+    from mila.tools import TOOLS
+    from mila.tools.client import HTTP
+    from mila.tools.compaction import COMPACTION
+    from mila.tools.workers import WORKERS
+
+    tools = f"http://127.0.0.1:{port}"
+    os.environ.update(
+        {"OPENWEATHERMAP_API_KEY": "bench", "SERPAPI_API_KEY": "bench"}
+    )
+    LOGGER.setLevel("WARNING")
+    config.HOROSCOPE_URL = f"{tools}/horoscope"
+    config.IMGFLIP_URL = f"{tools}/imgflip"
+    config.WEATHER_URL = f"{tools}/weather"
+    config.SEARCH_URL = f"{tools}/search"
+
+    runner = web.AppRunner(FakeTools().app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    try:
+        for name, arguments in CALLS.items():
+            await TOOLS.get(name)(
+                **{
+                    key: value.format(tools=tools)
+                    for key, value in arguments.items()
+                }
+            )
+    finally:
+        await HTTP.close()
+        WORKERS.shutdown()
+        await runner.cleanup()
+    return COMPACTION.snapshot()["tools"]
+
+
+def main() -> None:
+    """Measure and report."""
+    arguments = _arguments()
+    results = {
+        name: counters
+        for name, counters in asyncio.run(_measure(arguments.port)).items()
+        if counters["calls"]
+    }
+    if arguments.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'tool':<20} {'raw':>7} {'compact':>8} {'saved':>7} {'saved %':>8}"
+    )
+    for name, counters in results.items():
+        saved = counters["tokens_saved"] / (counters["raw_tokens"] or 1)
+        print(
+            f"{name:<20} {counters['raw_tokens']:>7} {counters['tokens']:>8}"
+            f" {counters['tokens_saved']:>7} {saved:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
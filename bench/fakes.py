@@ -0,0 +1,419 @@
+"""Provide local stand-ins for the OpenAI Assistants API and tool APIs."""
+
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+
+from aiohttp import web
+
+
+class FakeAssistants:
+    """Imitate the parts of the Assistants API that Mila uses.
+
+    Each run takes run_duration seconds. Before completing it stops for
+    each entry in actions, a list of (tool name, arguments) rounds, and
+    waits for tool outputs.
+    """
+
+    def __init__(self, run_duration: float = 0.5, actions: list = None):
+        """Initialize the fake API."""
+        self._run_duration = run_duration
+        self._actions = actions or []
+        self._ids = itertools.count()
+        self._assistants = {}
+        self._threads = {}
+        self._runs = {}
+        self.calls = Counter()
+
+    def _id(self, prefix: str) -> str:
+        """Make a new object ID."""
+        return f"{prefix}_{next(self._ids)}"
+
+    def _message(self, thread_id: str, role: str, content, run_id=None):
+        """Add a message to a thread."""
+        message = {
+            "id": self._id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "role": role,
+            "run_id": run_id,
+            "content": [
+                {
+                    "type": "text",
+                    "text": {"value": str(content), "annotations": []},
+                }
+            ],
+        }
+        self._threads[thread_id].append(message)
+        return message
+
+    def _advance(self, run: dict) -> None:
+        """Move a run along, according to how long it has been going."""
+        if run["status"] not in ("queued", "in_progress"):
+            return
+        phase = self._run_duration / (len(self._actions) + 1)
+        if time.monotonic() - run["_started"] < phase:
+            run["status"] = "in_progress"
+            return
+        if run["_step"] < len(self._actions):
+            name, arguments = self._actions[run["_step"]]
+            run["status"] = "requires_action"
+            run["required_action"] = {
+                "type": "submit_tool_outputs",
+                "submit_tool_outputs": {
+                    "tool_calls": [
+                        {
+                            "id": self._id("call"),
+                            "type": "function",
+                            "function": {
+                                "name": name,
+                                "arguments": json.dumps(arguments),
+                            },
+                        }
+                    ]
+                },
+            }
+            return
+        run["status"] = "completed"
+        self._message(
+            run["thread_id"],
+            "assistant",
+            f"Done after {run['_step']} tool rounds.",
+            run["id"],
+        )
+
+    @staticmethod
+    def _public(run: dict) -> dict:
+        """Strip the bookkeeping from a run."""
+        return {key: value for key, value in run.items() if key[0] != "_"}
+
+    async def _list_assistants(self, _request) -> web.Response:
+        """List the assistants."""
+        return web.json_response(
+            {
+                "object": "list",
+                "data": list(self._assistants.values()),
+                "has_more": False,
+            }
+        )
+
+    async def _create_assistant(self, request) -> web.Response:
+        """Create an assistant."""
+        body = await request.json()
+        assistant = {
+            "id": self._id("asst"),
+            "object": "assistant",
+            "created_at": int(time.time()),
+            "name": body.get("name"),
+            "model": body.get("model"),
+            "instructions": body.get("instructions"),
+            "tools": body.get("tools", []),
+            "metadata": body.get("metadata", {}),
+        }
+        self._assistants[assistant["id"]] = assistant
+        return web.json_response(assistant)
+
+    async def _get_assistant(self, request) -> web.Response:
+        """Retrieve or update an assistant."""
+        assistant = self._assistants.get(request.match_info["assistant"])
+        if assistant is None:
+            return web.json_response(
+                {"error": {"message": "No such assistant."}}, status=404
+            )
+        if request.method == "POST":
+            assistant.update(await request.json())
+        return web.json_response(assistant)
+
+    async def _create_thread(self, request) -> web.Response:
+        """Create a thread, with any initial messages."""
+        body = await request.json() if request.can_read_body else {}
+        thread_id = self._id("thread")
+        self._threads[thread_id] = []
+        for message in body.get("messages", []):
+            self._message(thread_id, message["role"], message["content"])
+        return web.json_response(
+            {
+                "id": thread_id,
+                "object": "thread",
+                "created_at": int(time.time()),
+                "metadata": {},
+            }
+        )
+
+    async def _delete_thread(self, request) -> web.Response:
+        """Delete a thread."""
+        thread_id = request.match_info["thread"]
+        if self._threads.pop(thread_id, None) is None:
+            return web.json_response(
+                {"error": {"message": "No such thread."}}, status=404
+            )
+        return web.json_response(
+            {"id": thread_id, "object": "thread.deleted", "deleted": True}
+        )
+
+    async def _messages(self, request) -> web.Response:
+        """Add a message to a thread, or list its messages."""
+        thread_id = request.match_info["thread"]
+        if request.method == "POST":
+            body = await request.json()
+            return web.json_response(
+                self._message(thread_id, body["role"], body["content"])
+            )
+        run_id = request.query.get("run_id")
+        data = [
+            message
+            for message in reversed(self._threads[thread_id])
+            if run_id is None or message["run_id"] == run_id
+        ]
+        return web.json_response(
+            {"object": "list", "data": data, "has_more": False}
+        )
+
+    async def _create_run(self, request) -> web.Response:
+        """Start a run, after adding any messages."""
+        body = await request.json()
+        thread_id = request.match_info.get("thread")
+        if thread_id is None:
+            thread_id = self._id("thread")
+            self._threads[thread_id] = []
+            body.setdefault("additional_messages", []).extend(
+                body.get("thread", {}).get("messages", [])
+            )
+        for message in body.get("additional_messages") or []:
+            self._message(thread_id, message["role"], message["content"])
+        run = {
+            "id": self._id("run"),
+            "object": "thread.run",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "assistant_id": body["assistant_id"],
+            "status": "queued",
+            "required_action": None,
+            "_started": time.monotonic(),
+            "_step": 0,
+        }
+        self._runs[run["id"]] = run
+        return web.json_response(self._public(run))
+
+    async def _get_run(self, request) -> web.Response:
+        """Check on a run."""
+        run = self._runs[request.match_info["run"]]
+        self._advance(run)
+        return web.json_response(self._public(run))
+
+    async def _submit(self, request) -> web.Response:
+        """Accept a run's tool outputs."""
+        run = self._runs[request.match_info["run"]]
+        await request.json()
+        run["status"] = "in_progress"
+        run["required_action"] = None
+        run["_step"] += 1
+        run["_started"] = time.monotonic()
+        return web.json_response(self._public(run))
+
+    async def _calls(self, _request) -> web.Response:
+        """Report the calls counted so far."""
+        return web.json_response(dict(self.calls))
+
+    @web.middleware
+    async def _count(self, request, handler):
+        """Count each call by method and route."""
+        if request.path == "/_calls":
+            return await handler(request)
+        resource = request.match_info.route.resource
+        path = resource.canonical if resource else request.path
+        self.calls[f"{request.method} {path}"] += 1
+        return await handler(request)
+
+    def app(self) -> web.Application:
+        """Build the web application."""
+        app = web.Application(middlewares=[self._count])
+        routes = [
+            ("GET", "/v1/assistants", self._list_assistants),
+            ("POST", "/v1/assistants", self._create_assistant),
+            ("*", "/v1/assistants/{assistant}", self._get_assistant),
+            ("POST", "/v1/threads", self._create_thread),
+            ("POST", "/v1/threads/runs", self._create_run),
+            ("DELETE", "/v1/threads/{thread}", self._delete_thread),
+            ("*", "/v1/threads/{thread}/messages", self._messages),
+            ("POST", "/v1/threads/{thread}/runs", self._create_run),
+            ("GET", "/v1/threads/{thread}/runs/{run}", self._get_run),
+            (
+                "POST",
+                "/v1/threads/{thread}/runs/{run}/submit_tool_outputs",
+                self._submit,
+            ),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, path, handler)
+        app.router.add_get("/_calls", self._calls)
+        return app
+
+
+class FakeTools:
+    """Imitate the third-party APIs behind Mila's tools."""
+
+    def __init__(self):
+        """Initialize the fake APIs."""
+        self.calls = Counter()
+
+    async def _horoscope(self, request) -> web.Response:
+        """Get a horoscope."""
+        self.calls["horoscope"] += 1
+        return web.json_response(
+            {
+                "data": {
+                    "date": "Jan 1, 2024",
+                    "horoscope_data": (
+                        f"A fine day for a {request.query['sign']}."
+                    ),
+                },
+                "status": 200,
+                "success": True,
+            }
+        )
+
+    async def _memes(self, _request) -> web.Response:
+        """List meme templates."""
+        self.calls["get_memes"] += 1
+        memes = [
+            {
+                "id": str(100000 + number),
+                "name": f"Template {number}",
+                "url": f"https://i.imgflip.com/{number}.jpg",
+                "width": 500,
+                "height": 500,
+                "box_count": 2 + number % 3,
+                "captions": number * 1000,
+            }
+            for number in range(100)
+        ]
+        return web.json_response({"success": True, "data": {"memes": memes}})
+
+    async def _caption(self, request) -> web.Response:
+        """Caption a meme."""
+        self.calls["caption_image"] += 1
+        form = await request.post()
+        return web.json_response(
+            {
+                "success": True,
+                "data": {
+                    "url": f"https://i.imgflip.com/{form['template_id']}.jpg",
+                    "page_url": "https://imgflip.com/i/0",
+                },
+            }
+        )
+
+    async def _weather(self, _request) -> web.Response:
+        """Get a five-day, three-hourly forecast."""
+        self.calls["weather"] += 1
+        start = 1_700_000_000
+        forecast = [
+            {
+                "dt": start + step * 3 * 60 * 60,
+                "main": {
+                    "temp": 60 + step % 8,
+                    "feels_like": 58 + step % 8,
+                    "temp_min": 55 + step % 8,
+                    "temp_max": 65 + step % 8,
+                    "pressure": 1015,
+                    "humidity": 60,
+                },
+                "weather": [
+                    {
+                        "id": 800,
+                        "main": "Clear",
+                        "description": "clear sky",
+                        "icon": "01d",
+                    }
+                ],
+                "clouds": {"all": 0},
+                "wind": {"speed": 5.0, "deg": 180, "gust": 7.0},
+                "visibility": 10000,
+                "pop": 0,
+                "sys": {"pod": "d"},
+                "dt_txt": time.strftime(
+                    "%Y-%m-%d %H:%M:%S",
+                    time.gmtime(start + step * 3 * 60 * 60),
+                ),
+            }
+            for step in range(40)
+        ]
+        return web.json_response(
+            {
+                "cod": "200",
+                "message": 0,
+                "cnt": len(forecast),
+                "list": forecast,
+                "city": {"name": "Springfield", "country": "US"},
+            }
+        )
+
+    async def _page(self, _request) -> web.Response:
+        """Serve a web page to scrape."""
+        self.calls["page"] += 1
+        paragraphs = "".join(
+            f"<p>Paragraph {number} of the article.</p>"
+            for number in range(200)
+        )
+        return web.Response(
+            text=(
+                "<html><head><title>Article</title>"
+                "<script>var tracking = true;</script></head>"
+                f"<body><nav>Menu</nav>{paragraphs}</body></html>"
+            ),
+            content_type="text/html",
+        )
+
+    async def _search(self, request) -> web.Response:
+        """Search the web."""
+        self.calls["search"] += 1
+        return web.json_response(
+            {
+                "organic_results": [
+                    {
+                        "title": f"Result {number} for {request.query['q']}",
+                        "link": f"https://example.com/{number}",
+                        "snippet": "A snippet of the result.",
+                    }
+                    for number in range(10)
+                ]
+            }
+        )
+
+    def app(self) -> web.Application:
+        """Build the web application."""
+        app = web.Application()
+        app.router.add_get(
+            "/horoscope/api/v1/get-horoscope/daily", self._horoscope
+        )
+        app.router.add_get("/imgflip/get_memes", self._memes)
+        app.router.add_post("/imgflip/caption_image", self._caption)
+        app.router.add_get("/weather", self._weather)
+        app.router.add_get("/page", self._page)
+        app.router.add_get("/search", self._search)
+        app.router.add_get("/_calls", self._calls)
+        return app
+
+    async def _calls(self, _request) -> web.Response:
+        """Report the calls counted so far."""
+        return web.json_response(dict(self.calls))
+
+
+async def _serve(port: int, run_duration: float, actions: list) -> None:
+    """Serve the fake Assistants API on port, and the tools on port + 1."""
+    for offset, app in enumerate(
+        [FakeAssistants(run_duration, actions).app(), FakeTools().app()]
+    ):
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port + offset).start()
+    await asyncio.Event().wait()
+
+
+def serve(port: int, run_duration: float, actions: list) -> None:
+    """Serve the fakes until killed; meant for a separate process."""
+    asyncio.run(_serve(port, run_duration, actions))
@@ -0,0 +1,111 @@
+"""Measure how long importing Mila takes, and what it drags in.
+
+Run from the repository root with ``python -m bench.imports``. Each
+import happens in a fresh interpreter, in an empty working directory and
+without an OpenAI API key, so side effects show up too.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HEAVY = ["aiohttp", "bs4", "discord", "lxml", "openai"]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _arguments() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="mila")
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Fresh imports to time."
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest imports to list."
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON."
+    )
+    return parser.parse_args()
+
+
+def _import(module: str, directory: str) -> tuple:
+    """Import a module in a fresh interpreter; get its -X importtime log."""
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key != "OPENAI_API_KEY"
+    }
+    env["PYTHONPATH"] = ROOT
+    probe = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=directory,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    timings = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, total, name = line.partition(":")[2].split("|")
+            if own.strip().isdigit():
+                # Nested imports are indented beyond the one leading space.
+                timings.append((name[1:].rstrip(), int(own), int(total)))
+    return timings, [name for name in result.stdout.strip().split(",") if name]
+
+
+def main() -> None:
+    """Time the imports and report."""
+    arguments = _arguments()
+    totals = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(arguments.runs):
+            timings, heavy = _import(arguments.module, directory)
+            totals.extend(
+                total for name, _, total in timings if name == arguments.module
+            )
+        created = sorted(os.listdir(directory))
+    slowest = sorted(timings, key=lambda timing: timing[1], reverse=True)
+    results = {
+        "module": arguments.module,
+        "import_ms": {
+            "median": round(statistics.median(totals) / 1000, 1),
+            "min": round(min(totals) / 1000, 1),
+            "max": round(max(totals) / 1000, 1),
+        },
+        "heavy_modules_loaded": heavy,
+        "files_created": created,
+        "slowest_ms": {
+            name.strip(): round(own / 1000, 2)
+            for name, own, _ in slowest[: arguments.top]
+        },
+    }
+    if arguments.json:
+        print(json.dumps(results, indent=2))
+        return
+    timing = results["import_ms"]
+    print(
+        f"import {arguments.module}: median {timing['median']} ms"
+        f" (min {timing['min']}, max {timing['max']},"
+        f" {arguments.runs} runs)"
+    )
+    print(f"Heavy modules loaded: {', '.join(heavy) or 'none'}")
+    print(f"Files created: {', '.join(created) or 'none'}")
+    print("Slowest imports (own time):")
+    for name, own in results["slowest_ms"].items():
+        print(f"  {own:>8} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-PATHS="milabot.py mila/*.py mila/tools/*.py"
+PATHS="milabot.py mila/*.py mila/tools/*.py bench/*.py tests/*.py"
 
 isort $PATHS
 black -l 79 $PATHS
@@ -1,8 +1,26 @@
 """Provide the Mila library."""
 
+import asyncio
+import time
+import uuid
+
+from mila import config
+from mila.admission import Admission, Ticket
 from mila.assistants import Assistant
-from mila.logging import LOGGER
+from mila.conversations import Conversations
+from mila.lifecycle import Janitor
+from mila.llm import LLM
+from mila.logging import LOGGER, clip, setup_logging
+from mila.metrics import METRICS
+from mila.polling import POLL_STATS
+from mila.prompts import PROMPTS
+from mila.ratelimit import RATE_LIMITER
 from mila.threads import Thread
+from mila.tools.cache import TOOL_CACHE
+from mila.tools.catalog import MEME_CATALOG
+from mila.tools.client import HTTP
+from mila.tools.compaction import COMPACTION
+from mila.tools.workers import WORKERS
 
 
 class Mila:
@@ -10,36 +28,175 @@ class Mila:
 
     def __init__(self):
         """Initialize Mila."""
+        setup_logging()
+        PROMPTS.preload()
+        self._admission = Admission()
         self._assistant = Assistant()
+        self._janitor = Janitor()
+        self._conversations = Conversations(retire=self._janitor.retire)
         self._threads = {}
+        self._tasks = {}
+        self._completions = asyncio.Queue()
+
+    async def close(self) -> None:
+        """Stop in-flight runs and release shared resources."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await self._janitor.close()
+        await MEME_CATALOG.close()
+        await METRICS.close()
+        await HTTP.close()
+        WORKERS.shutdown()
 
-    async def check_completion(self, thread_id: str) -> bool:
-        """Check whether a query run is complete."""
-        return await self._threads[thread_id].check()
+    async def completions(self):
+        """Yield (request_id, response, final) as responses arrive.
 
-    async def get_response(self, thread_id: str) -> str:
-        """Retrieve the final response from a given run."""
-        return await self._threads[thread_id].response()
+        When streaming, partial responses (final is False) precede the
+        final one for the same request.
+        """
+        while True:
+            yield await self._completions.get()
 
-    async def handle_message(
+    async def handle_message(  # pylint: disable=too-many-arguments
         self,
         author: str,
         name: str,
         query: str,
         context: str,
+        *,
+        recap: str = "",
+        channel: str = None,
+        guild: str = None,
     ) -> str:
-        """Handle an incoming message."""
-        LOGGER.info(
-            "Message received from %s (%s): %s",
-            author,
-            name,
-            query,
-        )
-        new_thread = Thread(
-            assistant_id=await self._assistant.id(),
-            context=context,
-            query=query,
-        )
-        thread_id = await new_thread.id()
-        self._threads[thread_id] = new_thread
-        return thread_id
+        """Handle an incoming message and return its request ID.
+
+        The recap of the chat so far is added to the context unless the
+        channel's thread already holds it. Messages without a guild are
+        admitted as DMs. Raises Overloaded if the message cannot be queued.
+        """
+        with METRICS.span("handle_message"):
+            LOGGER.info(
+                "Message received from %s (%s): %s",
+                author,
+                name,
+                clip(query),
+            )
+            request_id = uuid.uuid4().hex
+            assistant_id = await self._assistant.id()
+            ticket = self._admission.enqueue(
+                str(author), guild, "mention" if guild else "dm"
+            )
+            self._tasks[request_id] = asyncio.create_task(
+                self._supervise(
+                    request_id,
+                    channel,
+                    ticket,
+                    recap,
+                    assistant_id=assistant_id,
+                    context=context,
+                    query=query,
+                )
+            )
+        return request_id
+
+    async def setup(self) -> None:
+        """Connect to OpenAI, resolve the assistant, start background work."""
+        LLM.connect()
+        await self._assistant.id()
+        await METRICS.serve(self.stats)
+        MEME_CATALOG.start()
+
+    def stats(self) -> dict:
+        """Get runtime counters for tuning under load."""
+        return {
+            "admission": self._admission.snapshot(),
+            "polling": POLL_STATS.snapshot(),
+            "openai": RATE_LIMITER.snapshot(),
+            "http": HTTP.snapshot(),
+            "cache": TOOL_CACHE.snapshot(),
+            "compaction": COMPACTION.snapshot(),
+            "memes": MEME_CATALOG.snapshot(),
+            "lifecycle": {
+                "requests": len(self._threads),
+                "tasks": len(self._tasks),
+                "conversations": len(self._conversations),
+                **self._janitor.snapshot(),
+            },
+        }
+
+    async def _converse(self, request_id: str, thread: Thread) -> str:
+        """Drive a single thread to completion."""
+        self._threads[request_id] = thread
+        if config.STREAMING:
+            response, shown = "", 0.0
+            async for response in thread.stream():
+                if time.monotonic() - shown >= config.STREAM_EDIT_INTERVAL:
+                    shown = time.monotonic()
+                    await self._completions.put((request_id, response, False))
+            return response
+        while not await thread.check():
+            await thread.wait()
+        return await thread.response()
+
+    async def _supervise(
+        self,
+        request_id: str,
+        channel: str,
+        ticket: Ticket,
+        recap: str,
+        **thread_args,
+    ) -> None:
+        """Run a request, in its channel's thread if any, and queue it."""
+        context = thread_args.pop("context")
+        try:
+            with METRICS.span("admission"):
+                await ticket.granted
+            if config.CONVERSATION_MODE == "persistent" and channel:
+                async with self._conversations.turn(channel) as conversation:
+                    # Only now is it known whether the thread is fresh.
+                    thread = Thread(
+                        thread_id=conversation.thread_id,
+                        context=(
+                            context
+                            if conversation.thread_id
+                            else context + recap
+                        ),
+                        **thread_args,
+                    )
+                    try:
+                        response = await asyncio.wait_for(
+                            self._converse(request_id, thread),
+                            config.REQUEST_TTL,
+                        )
+                    except BaseException:
+                        # The thread may still hold a live run; start over.
+                        if thread.thread_id:
+                            self._janitor.retire(thread.thread_id)
+                        conversation.thread_id = None
+                        raise
+                    conversation.thread_id = thread.thread_id
+            else:
+                response = await asyncio.wait_for(
+                    self._converse(
+                        request_id,
+                        Thread(context=context + recap, **thread_args),
+                    ),
+                    config.REQUEST_TTL,
+                )
+        except asyncio.TimeoutError:
+            LOGGER.error("Request %s timed out.", request_id)
+            response = "Run error: timed out"
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.exception("Run supervisor failed: %s", err)
+            response = f"Run error: {err}"
+        finally:
+            self._admission.release(ticket)
+            self._tasks.pop(request_id, None)
+            thread = self._threads.pop(request_id, None)
+            if (
+                thread
+                and thread.thread_id
+                and config.CONVERSATION_MODE != "persistent"
+            ):
+                self._janitor.retire(thread.thread_id)
+        await self._completions.put((request_id, response, True))
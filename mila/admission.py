@@ -0,0 +1,164 @@
+"""Provide admission control for incoming requests."""
+
+import asyncio
+import time
+from collections import Counter, deque
+
+from mila import config
+
+
+def _decrement(counter: Counter, key) -> None:
+    """Count one fewer of a key, forgetting it at zero."""
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class Overloaded(Exception):
+    """Indicate that a request was shed because Mila is too busy."""
+
+
+class Ticket:
+    """Represent a request's place in line."""
+
+    def __init__(self, user: str, guild: str, kind: str):
+        """Initialize the ticket."""
+        self.user = user
+        self.guild = guild
+        self.kind = kind
+        self.queued = time.monotonic()
+        self.granted = asyncio.get_running_loop().create_future()
+        # The future is also done if its waiter was cancelled in line.
+        self.admitted = False
+
+
+class Admission:
+    """Limit concurrent requests and admit waiting ones fairly.
+
+    Requests are limited globally, per user and per guild. Waiting
+    requests are split into classes (DMs and mentions), which are served
+    by smooth weighted round-robin; within a class, the oldest request
+    that fits under its user's and guild's limits goes first.
+    """
+
+    def __init__(
+        self,
+        limit: int = config.ADMISSION_LIMIT,
+        user_limit: int = config.ADMISSION_USER_LIMIT,
+        guild_limit: int = config.ADMISSION_GUILD_LIMIT,
+        weights: dict = None,
+    ):
+        """Initialize the admission controller."""
+        self._limits = {
+            "total": limit,
+            "user": user_limit,
+            "guild": guild_limit,
+        }
+        self._weights = weights or config.ADMISSION_WEIGHTS
+        self._waiting = {kind: deque() for kind in self._weights}
+        self._credits = {kind: 0 for kind in self._weights}
+        self._active = 0
+        # Admitted requests per user and guild; waiting ones per user.
+        self._counts = {
+            "user": Counter(),
+            "guild": Counter(),
+            "queued": Counter(),
+        }
+        self._metrics = {
+            "admitted": 0,
+            "shed": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+        }
+
+    @property
+    def depth(self) -> int:
+        """Count the waiting requests."""
+        return sum(len(queue) for queue in self._waiting.values())
+
+    def _fits(self, ticket: Ticket) -> bool:
+        """Check whether a ticket fits under its user and guild limits."""
+        return self._counts["user"][ticket.user] < self._limits["user"] and (
+            ticket.guild is None
+            or self._counts["guild"][ticket.guild] < self._limits["guild"]
+        )
+
+    def _grant(self, ticket: Ticket) -> None:
+        """Admit a ticket."""
+        self._active += 1
+        self._counts["user"][ticket.user] += 1
+        if ticket.guild is not None:
+            self._counts["guild"][ticket.guild] += 1
+        wait = time.monotonic() - ticket.queued
+        self._metrics["admitted"] += 1
+        self._metrics["wait_total"] += wait
+        self._metrics["wait_max"] = max(self._metrics["wait_max"], wait)
+        ticket.admitted = True
+        ticket.granted.set_result(True)
+
+    def _dispatch(self) -> None:
+        """Admit waiting tickets while there is room."""
+        while self._active < self._limits["total"]:
+            candidates = {}
+            for kind, queue in self._waiting.items():
+                for ticket in queue:
+                    # A cancelled waiter leaves the line when released.
+                    if not ticket.granted.cancelled() and self._fits(ticket):
+                        candidates[kind] = ticket
+                        break
+            if not candidates:
+                return
+            for kind in candidates:
+                self._credits[kind] += self._weights[kind]
+            kind = max(candidates, key=self._credits.get)
+            self._credits[kind] -= sum(
+                self._weights[other] for other in candidates
+            )
+            ticket = candidates[kind]
+            self._waiting[kind].remove(ticket)
+            _decrement(self._counts["queued"], ticket.user)
+            self._grant(ticket)
+
+    def enqueue(self, user: str, guild: str, kind: str) -> Ticket:
+        """Take a place in line, or raise Overloaded if there is none."""
+        ticket = Ticket(user, guild, kind)
+        # Every waiting ticket is over a limit; _dispatch() admits any
+        # that fits as soon as it can. So one that fits now goes ahead.
+        if self._active < self._limits["total"] and self._fits(ticket):
+            self._grant(ticket)
+            return ticket
+        if (
+            self.depth >= config.ADMISSION_QUEUE
+            or self._counts["queued"][user] >= config.ADMISSION_USER_QUEUE
+        ):
+            self._metrics["shed"] += 1
+            raise Overloaded()
+        self._waiting[kind].append(ticket)
+        self._counts["queued"][user] += 1
+        return ticket
+
+    def release(self, ticket: Ticket) -> None:
+        """Give up a ticket, whether or not it was admitted."""
+        if ticket.admitted:
+            self._active -= 1
+            _decrement(self._counts["user"], ticket.user)
+            if ticket.guild is not None:
+                _decrement(self._counts["guild"], ticket.guild)
+        elif ticket in self._waiting[ticket.kind]:
+            self._waiting[ticket.kind].remove(ticket)
+            _decrement(self._counts["queued"], ticket.user)
+        self._dispatch()
+
+    def snapshot(self) -> dict:
+        """Get the current queue depth and wait-time metrics."""
+        admitted = self._metrics["admitted"]
+        return {
+            "active": self._active,
+            "depth": self.depth,
+            "admitted": admitted,
+            "shed": self._metrics["shed"],
+            "wait_mean": (
+                self._metrics["wait_total"] / admitted if admitted else 0.0
+            ),
+            "wait_max": self._metrics["wait_max"],
+        }
@@ -1,28 +1,32 @@
 """Provide access to the OpenAI Assistants feature."""
 
-
 import hashlib
 import json
+import os
 
 from mila import config
 from mila.llm import LLM
-from mila.logging import LOGGER
+from mila.logging import get_logger
 from mila.prompts import PROMPTS
 from mila.tools import TOOLS
 
+LOGGER = get_logger("assistants")
+
 
 def assistant_hash() -> str:
     """Get the hash of the current assistant."""
-    return hashlib.sha256(
+    digest = hashlib.sha256(
         json.dumps(
             {
                 "instructions": PROMPTS["system"],
-                "tools": TOOLS.definitions,
                 "model": config.MODEL,
                 "version": config.VERSION,
             }
         ).encode("utf-8")
-    ).hexdigest()
+    )
+    # The tool definitions are serialized once, when they are loaded.
+    digest.update(TOOLS.serialized.encode("utf-8"))
+    return digest.hexdigest()
 
 
 class Assistant:
@@ -32,38 +36,68 @@ class Assistant:
         """Initialize the assistant."""
         self._assistant = None
 
-    async def _spawn_assistant(self) -> None:
-        """Link or spawn an assistant for the bot."""
-        assistants = await LLM.beta.assistants.list(limit=100)
-        for assistant in assistants.data:
+    async def _cached_assistant(self):
+        """Retrieve the assistant recorded in the local cache, if valid."""
+        import openai  # pylint: disable=import-outside-toplevel
+
+        try:
+            with open(config.ASSISTANT_CACHE, "r", encoding="utf-8") as file:
+                cached = json.load(file)
+            assistant = await LLM.beta.assistants.retrieve(cached["id"])
+        except (OSError, ValueError, KeyError):
+            return None
+        except openai.NotFoundError:
+            LOGGER.info("Cached assistant no longer exists.")
+            return None
+        if assistant.name != config.NAME:
+            return None
+        LOGGER.info("Cached assistant found.")
+        return assistant
+
+    async def _find_assistant(self):
+        """Search every page of the account's assistants by name."""
+        async for assistant in LLM.beta.assistants.list(limit=100):
             if assistant.name == config.NAME:
                 LOGGER.info("Assistant found.")
-                if (
-                    "hash" not in assistant.metadata.keys()
-                    or assistant.metadata["hash"] != assistant_hash()
-                ):
-                    await LLM.beta.assistants.update(
-                        assistant.id,
-                        instructions=PROMPTS["system"],
-                        tools=TOOLS.definitions,
-                        model=config.MODEL,
-                        metadata={
-                            "hash": assistant_hash(),
-                        },
-                    )
-                    LOGGER.info("Assistant updated.")
-                self._assistant = assistant
-                return
-        LOGGER.info("No assistants found. New assistant spawned.")
-        self._assistant = await LLM.beta.assistants.create(
-            instructions=PROMPTS["system"],
-            name=config.NAME,
-            model=config.MODEL,
-            tools=TOOLS.definitions,
-            metadata={
-                "hash": assistant_hash(),
-            },
-        )
+                return assistant
+        return None
+
+    def _save(self, current_hash: str) -> None:
+        """Record the assistant in the local cache."""
+        os.makedirs(os.path.dirname(config.ASSISTANT_CACHE), exist_ok=True)
+        with open(config.ASSISTANT_CACHE, "w", encoding="utf-8") as file:
+            json.dump({"id": self._assistant.id, "hash": current_hash}, file)
+
+    async def _spawn_assistant(self) -> None:
+        """Link or spawn an assistant for the bot."""
+        current_hash = assistant_hash()
+        assistant = await self._cached_assistant()
+        if not assistant:
+            assistant = await self._find_assistant()
+        if not assistant:
+            LOGGER.info("No assistants found. New assistant spawned.")
+            assistant = await LLM.beta.assistants.create(
+                instructions=PROMPTS["system"],
+                name=config.NAME,
+                model=config.MODEL,
+                tools=TOOLS.definitions,
+                metadata={
+                    "hash": current_hash,
+                },
+            )
+        elif (assistant.metadata or {}).get("hash") != current_hash:
+            assistant = await LLM.beta.assistants.update(
+                assistant.id,
+                instructions=PROMPTS["system"],
+                tools=TOOLS.definitions,
+                model=config.MODEL,
+                metadata={
+                    "hash": current_hash,
+                },
+            )
+            LOGGER.info("Assistant updated.")
+        self._assistant = assistant
+        self._save(current_hash)
 
     async def _ready(self) -> None:
         """Get the assistant for the bot."""
@@ -12,7 +12,99 @@ DESCRIPTION = "the Mindful, Interactive Lifestyle Assistant"
 # LLM Settings
 MODEL = "gpt-3.5-turbo-1106"  # If unavailable, use "gpt-3.5-turbo-16k".
 PROMPT_PATH = "mila/prompts/"
+PROMPT_RELOAD_INTERVAL = 5  # How often to check prompt files for edits.
+ASSISTANT_CACHE = "cache/assistant.json"  # Where to remember the assistant.
+
+# Conversations
+CONVERSATION_MODE = "stateless"  # Or "persistent", for one thread per channel.
+CONVERSATION_TTL = 60 * 60  # Idle time before a channel's thread is replaced.
+CONVERSATION_MAX_TURNS = 50  # Turns before a channel's thread is replaced.
+CONVERSATION_LIMIT = 10000  # Channels to track before forgetting idle ones.
+
+# Admission
+ADMISSION_LIMIT = 50  # Requests to run at once, across all users.
+ADMISSION_USER_LIMIT = 2  # Requests to run at once for a single user.
+ADMISSION_GUILD_LIMIT = 20  # Requests to run at once for a single guild.
+ADMISSION_QUEUE = 200  # Requests to hold in line before turning them away.
+ADMISSION_USER_QUEUE = 5  # Requests a single user may hold in line.
+ADMISSION_WEIGHTS = {"mention": 2, "dm": 1}  # Share of admissions per class.
+OVERLOADED_REPLY = "I'm swamped right now. Please try again in a minute."
+ERROR_REPLY = "Something went wrong on my end. Please try again."
+
+# Lifecycle
+REQUEST_TTL = 10 * 60  # Longest a request may run before it is abandoned.
+JANITOR_BATCH = 10  # Finished threads to delete at once.
+JANITOR_INTERVAL = 1.0  # Delay between deletion batches, in seconds.
+JANITOR_BACKLOG = 10000  # Most finished threads to hold for deletion.
+
+# Runs
+STREAMING = False  # Stream responses as they are written, instead of polling.
+STREAM_EDIT_INTERVAL = 1.0  # Least time between partial responses, in seconds.
+POLL_INTERVAL = 0.25  # Initial delay between run status checks, in seconds.
+POLL_MAX_INTERVAL = 2.0  # Longest delay between run status checks.
+POLL_BACKOFF = 1.5  # Growth factor for the delay while a run is unchanged.
+POLL_JITTER = 0.2  # Fractional jitter applied to each delay.
+POLL_RATE_LIMIT = 100  # Status checks per second, shared by all runs.
+
+# Rate limits
+RATE_LIMIT_REQUEST_RESERVE = 5  # OpenAI requests to leave unspent.
+RATE_LIMIT_TOKEN_RESERVE = 2000  # OpenAI tokens to leave unspent.
+RATE_LIMIT_RETRY = 1.0  # Seconds to hold calls after an unexplained 429.
+
+# Tools
+TOOL_TIMEOUT = 10  # Default deadline for a single tool call, in seconds.
+TOOL_RUN_TIMEOUT = 30  # Deadline for all of a turn's tool calls, in seconds.
+TOOL_CACHE_SIZE = 1024  # Most tool results to keep in memory at once.
+TOOL_OUTPUT_MAX_CHARS = 10000  # Most of any tool's output to give the model.
+TOOL_CHARS_PER_TOKEN = 4  # Rough characters per token, for estimates.
+
+# Tool endpoints
+HOROSCOPE_URL = "https://horoscope-app-api.vercel.app"
+IMGFLIP_URL = "https://api.imgflip.com"
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/forecast"
+SEARCH_URL = "https://serpapi.com/search.json"
+
+# Meme templates
+MEME_CATALOG_REFRESH = 24 * 60 * 60  # How often to reload ImgFlip's list.
+MEME_CATALOG_RETRY = 60  # Wait before retrying a failed reload, in seconds.
+MEME_TEMPLATES = 5  # Most templates to offer the model at once.
+
+# HTTP
+HTTP_POOL_SIZE = 100  # Open connections shared by all tools.
+HTTP_POOL_PER_HOST = 10  # Open connections to any single host.
+HTTP_DNS_TTL = 300  # How long to cache DNS lookups, in seconds.
+HTTP_TIMEOUT = 5  # Deadline for a single HTTP request, in seconds.
+SEARCH_TIMEOUT = 8  # Deadline for a search engine request, in seconds.
+
+# Scraping
+SCRAPE_CONTENT_TYPES = ["text/html", "application/xhtml+xml", "text/plain"]
+SCRAPE_MAX_BYTES = 2 * 1024 * 1024  # Most of a page to download.
+SCRAPE_MAX_CHARS = 8000  # Most extracted text to hand the model (~2k tokens).
+TOOL_WORKERS = 2  # Worker processes for parsing and other CPU-bound work.
+
+# Discord
+MESSAGE_LIMIT = 2000  # Longest message Discord accepts, in characters.
+DELIVERY_RATE = 5  # Messages sent or edited per channel, per window.
+DELIVERY_WINDOW = 5.0  # Length of a channel's rate limit window, in seconds.
+
+# Metrics
+METRICS_SAMPLES = 1000  # Recent durations kept per stage for quantiles.
+METRICS_HOST = "127.0.0.1"  # Where to serve Prometheus metrics.
+METRICS_PORT = 9464  # Port for Prometheus metrics; 0 disables them.
+STATS_COMMAND = "!stats"  # Message that asks for stats (admins only).
 
 # Logging
 LOG_LEVEL = logging.DEBUG
+LOG_LEVELS = {  # Levels for particular subsystems, by logger name.
+    "Mila.runs": logging.INFO,  # DEBUG shows every poll.
+    "discord": logging.INFO,
+}
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Size at which the log file is rotated.
+LOG_BACKUPS = 5  # Rotated log files to keep.
+LOG_SAMPLED = {  # High-frequency loggers, and the levels sampled from them.
+    "Mila.runs": logging.DEBUG,  # Every poll, if DEBUG is enabled above.
+}
+LOG_SAMPLE_RATE = 10  # Sampled messages of each kind to log per window.
+LOG_SAMPLE_WINDOW = 10.0  # Seconds per sampling window.
+LOG_QUERY_CHARS = 100  # How much of each user query to log.
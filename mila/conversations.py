@@ -0,0 +1,68 @@
+"""Provide long-lived OpenAI threads for Discord channels."""
+
+import asyncio
+import contextlib
+import time
+
+from mila import config
+
+
+class Conversation:
+    """Represent a single channel's long-lived thread."""
+
+    def __init__(self):
+        """Initialize the conversation."""
+        self.thread_id = None
+        self.turns = 0
+        self.last_used = 0.0
+        self.lock = asyncio.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Check whether the thread may take another turn."""
+        return (
+            self.thread_id is not None
+            and self.turns < config.CONVERSATION_MAX_TURNS
+            and time.monotonic() - self.last_used < config.CONVERSATION_TTL
+        )
+
+
+class Conversations:
+    """Map each channel onto its conversation."""
+
+    def __init__(self, retire: callable):
+        """Initialize the conversations, given a way to retire threads."""
+        self._conversations = {}
+        self._retire = retire
+
+    def __len__(self) -> int:
+        """Count the tracked channels."""
+        return len(self._conversations)
+
+    def _prune(self) -> None:
+        """Forget idle channels once there are too many."""
+        if len(self._conversations) < config.CONVERSATION_LIMIT:
+            return
+        for channel, conversation in list(self._conversations.items()):
+            if not conversation.active and not conversation.lock.locked():
+                if conversation.thread_id:
+                    self._retire(conversation.thread_id)
+                del self._conversations[channel]
+
+    @contextlib.asynccontextmanager
+    async def turn(self, channel: str):
+        """Take the channel's next turn, one at a time."""
+        if channel not in self._conversations:
+            self._prune()
+            self._conversations[channel] = Conversation()
+        conversation = self._conversations[channel]
+        async with conversation.lock:
+            if not conversation.active:
+                # Rotate to a fresh thread.
+                if conversation.thread_id:
+                    self._retire(conversation.thread_id)
+                conversation.thread_id = None
+                conversation.turns = 0
+            yield conversation
+            conversation.turns += 1
+            conversation.last_used = time.monotonic()
@@ -0,0 +1,176 @@
+"""Provide paced, ordered delivery of outgoing chat messages."""
+
+import asyncio
+import time
+from collections import deque
+
+from mila import config
+from mila.logging import get_logger
+
+LOGGER = get_logger("delivery")
+CONTINUED = "(continued)"
+FENCE = "```"
+FENCE_LANGUAGE_MAX = 20  # Longest language tag to carry into a new chunk.
+
+
+def _fence(line: str) -> str:
+    """Get the marker and language to reopen a code block with."""
+    language = line.removeprefix(FENCE).split(maxsplit=1)
+    if language and len(language[0]) <= FENCE_LANGUAGE_MAX:
+        return FENCE + language[0]
+    return FENCE
+
+
+def chunk(text: str, limit: int = config.MESSAGE_LIMIT) -> list:
+    """Split text into messages of at most limit characters.
+
+    Lines are kept whole where possible and hard-split where not. A code
+    block cut between messages is closed at the end of one and reopened,
+    with its language, at the start of the next.
+    """
+    chunks = []
+    fence = None  # The current code block's marker and language, if any.
+    lines = []
+    head = 0  # How many of the lines were carried over from the last chunk.
+
+    def length(extra: str, fenced: bool) -> int:
+        """Measure the chunk with a line added and any block closed."""
+        return len("\n".join(lines + [extra])) + (
+            len(FENCE) + 1 if fenced else 0
+        )
+
+    def flush() -> None:
+        """Close the current chunk and start the next."""
+        nonlocal lines, head
+        chunks.append("\n".join(lines + ([FENCE] if fence else [])))
+        lines = [CONTINUED] + ([fence] if fence else [])
+        head = len(lines)
+
+    for line in text.split("\n"):
+        stripped = line.strip()
+        # A line such as "```x = 1```" holds a whole block; it opens none.
+        opens = (
+            fence is None
+            and stripped.startswith(FENCE)
+            and FENCE not in stripped.removeprefix(FENCE)
+        )
+        # Discord closes a block at the next fence, whatever follows it.
+        closes = fence is not None and stripped.startswith(FENCE)
+        fenced = (fence is not None and not closes) or opens
+        if len(lines) > head and length(line, fenced) > limit:
+            flush()
+        # From here on, the line's chunks close and reopen as it leaves
+        # the block, matching how they are measured.
+        if opens:
+            fence = _fence(stripped)
+        elif closes:
+            fence = None
+        while line and length(line, fenced) > limit:
+            # Even a fresh chunk cannot hold this line; hard-split it.
+            room = max(1, limit - length("", fenced))
+            lines.append(line[:room])
+            line = line[room:]
+            flush()
+        lines.append(line)
+    if len(lines) > head or not chunks:
+        chunks.append("\n".join(lines + ([FENCE] if fence else [])))
+    return chunks
+
+
+class Outbox:
+    """Send each channel's messages in order, paced to its rate limit."""
+
+    def __init__(
+        self,
+        rate: int = config.DELIVERY_RATE,
+        window: float = config.DELIVERY_WINDOW,
+    ):
+        """Initialize the outbox."""
+        self._rate = rate
+        self._window = window
+        self._queues = {}
+        self._workers = {}
+        self._sent = {}
+        self.calls = 0
+        self.retries = 0
+
+    async def _pace(self, channel) -> None:
+        """Wait until the channel's bucket has room for another call."""
+        sent = self._sent.setdefault(channel, deque())
+        now = time.monotonic()
+        while sent and now - sent[0] >= self._window:
+            sent.popleft()
+        if len(sent) >= self._rate:
+            await asyncio.sleep(self._window - (now - sent.popleft()))
+        sent.append(time.monotonic())
+
+    async def _call(self, channel, operation: callable, previous):
+        """Make a single paced call, retrying once if rate limited."""
+        await self._pace(channel)
+        self.calls += 1
+        try:
+            return await operation(previous)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            retry_after = getattr(err, "retry_after", None)
+            if retry_after is None:
+                raise
+            LOGGER.warning("Rate limited; retrying in %ss.", retry_after)
+            self.retries += 1
+            await asyncio.sleep(retry_after)
+            return await operation(previous)
+
+    async def _work(self, channel) -> None:
+        """Drain a channel's queue, one batch at a time."""
+        queue = self._queues[channel]
+        try:
+            while queue:
+                operations, future = queue.popleft()
+                try:
+                    result = None
+                    for operation in operations:
+                        result = await self._call(channel, operation, result)
+                    future.set_result(result)
+                # pylint: disable-next=broad-exception-caught
+                except Exception as err:
+                    future.set_exception(err)
+        finally:
+            self._queues.pop(channel)
+            self._workers.pop(channel)
+            # The last call still counts against the bucket for a while.
+            asyncio.get_running_loop().call_later(
+                self._window, self._forget, channel
+            )
+
+    def _forget(self, channel) -> None:
+        """Drop an idle channel's timestamps once they leave the window."""
+        sent = self._sent.get(channel)
+        if channel in self._workers or sent is None:
+            return
+        now = time.monotonic()
+        while sent and now - sent[0] >= self._window:
+            sent.popleft()
+        if not sent:
+            del self._sent[channel]
+
+    async def send(self, channel, operations: list):
+        """Queue a batch of calls for a channel and await the last result.
+
+        Each operation is an async callable that makes one API call. It
+        receives the previous operation's result (None for the first),
+        so replies can chain. A batch is never interleaved with others.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(channel, deque()).append((operations, future))
+        if channel not in self._workers:
+            self._workers[channel] = asyncio.create_task(self._work(channel))
+        return await future
+
+    def snapshot(self) -> dict:
+        """Get the current queue metrics."""
+        return {
+            "channels": len(self._queues),
+            "paced": len(self._sent),
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "calls": self.calls,
+            "retries": self.retries,
+        }
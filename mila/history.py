@@ -0,0 +1,57 @@
+"""Provide bounded buffers of recent chat messages."""
+
+from collections import OrderedDict, deque
+
+
+class History:
+    """Keep each active channel's most recent messages in memory."""
+
+    def __init__(self, size: int, channels: int):
+        """Initialize the history."""
+        self._size = size
+        self._channels = channels
+        self._buffers = OrderedDict()
+
+    def __contains__(self, channel: str) -> bool:
+        """Check whether a channel's recent messages are being kept."""
+        return channel in self._buffers
+
+    def __len__(self) -> int:
+        """Count the channels being kept."""
+        return len(self._buffers)
+
+    def add(self, channel: str, message_id: int, author: str, content: str):
+        """Record a new message in a channel that is being kept."""
+        buffer = self._buffers.get(channel)
+        if buffer is not None:
+            buffer.append([message_id, author, content])
+
+    def backfill(self, channel: str, messages: list) -> None:
+        """Start keeping a channel, seeded with (id, author, content)."""
+        self._buffers[channel] = deque(
+            [list(message) for message in messages], maxlen=self._size
+        )
+        self._buffers.move_to_end(channel)
+        while len(self._buffers) > self._channels:
+            self._buffers.popitem(last=False)
+
+    def delete(self, channel: str, message_id: int) -> None:
+        """Forget a deleted message."""
+        buffer = self._buffers.get(channel)
+        if buffer is not None:
+            for message in list(buffer):
+                if message[0] == message_id:
+                    buffer.remove(message)
+
+    def edit(self, channel: str, message_id: int, content: str) -> None:
+        """Update an edited message."""
+        for message in self._buffers.get(channel, ()):
+            if message[0] == message_id:
+                message[2] = content
+
+    def recent(self, channel: str) -> list:
+        """Get a channel's (author, content) pairs, oldest first."""
+        self._buffers.move_to_end(channel)
+        return [
+            (author, content) for _, author, content in self._buffers[channel]
+        ]
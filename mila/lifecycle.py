@@ -0,0 +1,81 @@
+"""Provide cleanup of OpenAI threads that are no longer needed."""
+
+import asyncio
+from collections import deque
+
+from mila import config
+from mila.llm import LLM
+from mila.logging import get_logger
+
+LOGGER = get_logger("lifecycle")
+
+
+class Janitor:
+    """Delete retired threads in bounded background batches."""
+
+    def __init__(
+        self,
+        batch: int = config.JANITOR_BATCH,
+        interval: float = config.JANITOR_INTERVAL,
+    ):
+        """Initialize the janitor."""
+        self._batch = batch
+        self._interval = interval
+        self._pending = deque()
+        self._task = None
+        self.deleted = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        """Count the threads awaiting deletion."""
+        return len(self._pending)
+
+    async def _delete(self, thread_id: str) -> None:
+        """Delete a single thread."""
+        import openai  # pylint: disable=import-outside-toplevel
+
+        try:
+            await LLM.beta.threads.delete(thread_id)
+            self.deleted += 1
+        except openai.NotFoundError:
+            self.deleted += 1
+        except openai.OpenAIError as err:
+            LOGGER.warning("Could not delete thread %s: %s", thread_id, err)
+            self.failed += 1
+
+    async def _sweep(self) -> None:
+        """Delete pending threads, a batch at a time, until none remain."""
+        while self._pending:
+            await asyncio.sleep(self._interval)
+            batch = [
+                self._pending.popleft()
+                for _ in range(min(self._batch, len(self._pending)))
+            ]
+            await asyncio.gather(*(self._delete(item) for item in batch))
+        self._task = None
+
+    def retire(self, thread_id: str) -> None:
+        """Schedule a thread for deletion."""
+        if len(self._pending) >= config.JANITOR_BACKLOG:
+            LOGGER.warning("Janitor backlog full; abandoning %s.", thread_id)
+            self.dropped += 1
+            return
+        self._pending.append(thread_id)
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep())
+
+    async def close(self) -> None:
+        """Stop sweeping; threads still pending are left in place."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Get the current cleanup counters."""
+        return {
+            "pending": len(self._pending),
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
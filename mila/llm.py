@@ -1,5 +1,37 @@
 """Provide access to the OpenAI LLM."""
 
-import openai
+from mila.ratelimit import RATE_LIMITER
 
-LLM = openai.AsyncOpenAI()
+
+class Client:
+    """Build the OpenAI client when it is first needed.
+
+    The openai package is slow to import, and its client insists on an
+    API key, so neither happens until Mila connects or makes a call.
+    """
+
+    def __init__(self):
+        """Initialize the client."""
+        self._client = None
+
+    def __getattr__(self, name: str):
+        """Pass attribute access through to the OpenAI client."""
+        return getattr(self.connect(), name)
+
+    def connect(self):
+        """Get the OpenAI client, building it on first use."""
+        if self._client is None:
+            import openai  # pylint: disable=import-outside-toplevel
+
+            self._client = openai.AsyncOpenAI(
+                http_client=openai.DefaultAsyncHttpxClient(
+                    event_hooks={
+                        "request": [RATE_LIMITER.on_request],
+                        "response": [RATE_LIMITER.on_response],
+                    }
+                )
+            )
+        return self._client
+
+
+LLM = Client()
@@ -1,35 +1,134 @@
 """MilaBot logging module."""
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import time
+
+from mila.config import (
+    LOG_BACKUPS,
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_MAX_BYTES,
+    LOG_QUERY_CHARS,
+    LOG_SAMPLE_RATE,
+    LOG_SAMPLE_WINDOW,
+    LOG_SAMPLED,
+    NAME,
+)
+
+
+class Sampler(logging.Filter):
+    """Let through only a few of each high-frequency message per window.
+
+    Only records from the given loggers (and their children), at or
+    below each logger's given level, are sampled; all others pass. The
+    next sampled message to pass after some were dropped says how many.
+    """
+
+    def __init__(
+        self,
+        loggers: dict = None,
+        rate: int = LOG_SAMPLE_RATE,
+        window: float = LOG_SAMPLE_WINDOW,
+    ):
+        """Initialize the sampler."""
+        super().__init__()
+        self._loggers = LOG_SAMPLED if loggers is None else loggers
+        self._rate = rate
+        self._window = window
+        self._seen = {}  # (logger, message) -> (start, passed, dropped)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record passes."""
+        if not any(
+            record.levelno <= level
+            and (record.name == name or record.name.startswith(f"{name}."))
+            for name, level in self._loggers.items()
+        ):
+            return True
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        start, passed, dropped = self._seen.get(key, (now, 0, 0))
+        if now - start >= self._window:
+            start, passed = now, 0
+        if passed >= self._rate:
+            self._seen[key] = (start, passed, dropped + 1)
+            return False
+        if dropped:
+            record.msg = f"{record.msg} [{dropped} similar suppressed]"
+        if len(self._seen) >= 1000:
+            self._seen.clear()
+        self._seen[key] = (start, passed + 1, 0)
+        return True
+
+
+def clip(text: str, limit: int = LOG_QUERY_CHARS) -> str:
+    """Shorten user-supplied text for the logs."""
+    text = str(text)
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Get the logger for one of Mila's subsystems."""
+    return LOGGER.getChild(subsystem)
 
-from mila.config import LOG_FORMAT, LOG_LEVEL, NAME
 
 # Create a logger for the Mila bot, used by both the Discord and AI modules.
+# Nothing is written anywhere until setup_logging() is called.
 LOGGER = logging.getLogger(NAME)
 LOGGER.setLevel(LOG_LEVEL)
 
-# Ensure the logs directory exists.
-if not os.path.exists("logs"):
-    os.mkdir("logs")
 
-# Create a file handler for the logger.
-fh = logging.FileHandler(f"logs/{NAME}.log")
-fh.setLevel(LOG_LEVEL)
+def setup_logging() -> None:
+    """Start writing Mila's and discord.py's logs, unless already set up."""
+    if LOGGER.handlers:
+        return
 
-# Create a stream handler for the logger.
-sh = logging.StreamHandler()
-sh.setLevel(LOG_LEVEL)
+    # Subsystems (e.g. "Mila.runs" or "discord.gateway") may log at their own.
+    for logger_name, level in LOG_LEVELS.items():
+        logging.getLogger(logger_name).setLevel(level)
 
-# Create a formatter for the logger.
-formatter = logging.Formatter(
-    LOG_FORMAT,
-)
+    # Ensure the logs directory exists.
+    if not os.path.exists("logs"):
+        os.mkdir("logs")
+
+    # Create a rotating file handler for the logger.
+    fh = logging.handlers.RotatingFileHandler(
+        f"logs/{NAME}.log",
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUPS,
+        encoding="utf-8",
+    )
+    fh.setLevel(LOG_LEVEL)
+
+    # Create a stream handler for the logger.
+    sh = logging.StreamHandler()
+    sh.setLevel(LOG_LEVEL)
+
+    # Create a formatter for the logger.
+    formatter = logging.Formatter(
+        LOG_FORMAT,
+    )
+
+    # Add the formatter to the handlers.
+    fh.setFormatter(formatter)
+    sh.setFormatter(formatter)
 
-# Add the formatter to the handlers.
-fh.setFormatter(formatter)
-sh.setFormatter(formatter)
+    # Write records from a background thread, so disk I/O never blocks the
+    # event loop; the loop only samples the noisiest and queues them all.
+    records = queue.SimpleQueue()
+    qh = logging.handlers.QueueHandler(records)
+    qh.addFilter(Sampler())
+    listener = logging.handlers.QueueListener(
+        records, fh, sh, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
 
-# Add the handlers to the logger.
-LOGGER.addHandler(fh)
-LOGGER.addHandler(sh)
+    # Add the queue handler to Mila's logger and to discord.py's.
+    LOGGER.addHandler(qh)
+    logging.getLogger("discord").addHandler(qh)
@@ -0,0 +1,155 @@
+"""Provide latency histograms and counters for Mila's stages."""
+
+import contextlib
+import math
+import time
+from collections import deque
+
+from mila import config
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _labels(labels: dict) -> str:
+    """Format labels for the Prometheus text format."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+class Histogram:
+    """Summarize durations by their recent quantiles."""
+
+    def __init__(self, samples: int = config.METRICS_SAMPLES):
+        """Initialize the histogram."""
+        self._samples = deque(maxlen=samples)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single duration."""
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantiles(self) -> dict:
+        """Get the quantiles of the recent durations."""
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {quantile: 0.0 for quantile in QUANTILES}
+        return {
+            quantile: ordered[
+                min(len(ordered) - 1, math.ceil(quantile * len(ordered)) - 1)
+            ]
+            for quantile in QUANTILES
+        }
+
+
+class Metrics:
+    """Collect timing spans and counters from every stage."""
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self._histograms = {}
+        self._counters = {}
+        self._runner = None
+
+    def count(self, name: str, amount: int = 1, **labels) -> None:
+        """Add to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record a duration for a stage."""
+        key = (name, tuple(sorted(labels.items())))
+        if key not in self._histograms:
+            self._histograms[key] = Histogram()
+        self._histograms[key].observe(seconds)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **labels):
+        """Time a stage, counting it as an error if it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.count("errors", stage=name, **labels)
+            raise
+        finally:
+            self.observe(name, time.monotonic() - start, **labels)
+
+    def summary(self) -> list:
+        """Get one line per stage, for people rather than scrapers."""
+        lines = []
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            quantiles = histogram.quantiles()
+            lines.append(
+                f"{name}{_labels(dict(labels))}: n={histogram.count} "
+                + " ".join(
+                    f"p{round(quantile * 100)}={value * 1000:.0f}ms"
+                    for quantile, value in quantiles.items()
+                )
+            )
+        for (name, labels), value in sorted(self._counters.items()):
+            lines.append(f"{name}{_labels(dict(labels))}: {value}")
+        return lines
+
+    def render(self, stats: dict = None) -> str:
+        """Render the metrics, and any stats, in the Prometheus format."""
+        lines = ["# TYPE mila_stage_seconds summary"]
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            labels = {"stage": name, **dict(labels)}
+            for quantile, value in histogram.quantiles().items():
+                lines.append(
+                    "mila_stage_seconds"
+                    f"{_labels({**labels, 'quantile': quantile})} {value}"
+                )
+            lines.append(
+                f"mila_stage_seconds_sum{_labels(labels)} {histogram.total}"
+            )
+            lines.append(
+                f"mila_stage_seconds_count{_labels(labels)} {histogram.count}"
+            )
+        typed = set()
+        for (name, labels), value in sorted(self._counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE mila_{name}_total counter")
+            lines.append(f"mila_{name}_total{_labels(dict(labels))} {value}")
+        for section, values in (stats or {}).items():
+            for key, value in values.items():
+                if isinstance(value, (int, float)):
+                    lines.append(f"# TYPE mila_{section}_{key} gauge")
+                    lines.append(f"mila_{section}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+    async def serve(
+        self,
+        stats: callable,
+        host: str = config.METRICS_HOST,
+        port: int = config.METRICS_PORT,
+    ) -> None:
+        """Serve the metrics, and Mila's stats, for a Prometheus scraper."""
+        if not port or self._runner:
+            return
+        from aiohttp import web  # pylint: disable=import-outside-toplevel
+
+        async def scrape(_request: web.Request) -> web.Response:
+            """Answer a scrape."""
+            return web.Response(text=self.render(stats()))
+
+        app = web.Application()
+        app.router.add_get("/metrics", scrape)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def close(self) -> None:
+        """Stop serving the metrics."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+METRICS = Metrics()
@@ -0,0 +1,100 @@
+"""Provide polling schedules and budgets for OpenAI runs."""
+
+import asyncio
+import random
+import time
+
+from mila import config
+
+
+class Backoff:
+    """Compute exponentially growing, jittered delays between polls."""
+
+    def __init__(
+        self,
+        initial: float = config.POLL_INTERVAL,
+        maximum: float = config.POLL_MAX_INTERVAL,
+        factor: float = config.POLL_BACKOFF,
+        jitter: float = config.POLL_JITTER,
+    ):
+        """Initialize the backoff."""
+        self._initial = initial
+        self._maximum = maximum
+        self._factor = factor
+        self._jitter = jitter
+        self._delay = initial
+
+    def next(self) -> float:
+        """Get the next delay, then grow it."""
+        delay = self._delay * random.uniform(
+            1 - self._jitter, 1 + self._jitter
+        )
+        self._delay = min(self._delay * self._factor, self._maximum)
+        return delay
+
+    def reset(self) -> None:
+        """Return to polling at the initial rate."""
+        self._delay = self._initial
+
+
+class Budget:
+    """Share a requests-per-second budget across every caller."""
+
+    def __init__(self, rate: float, burst: float = None):
+        """Initialize the budget."""
+        self._rate = rate
+        self._burst = burst or rate
+        self._tokens = self._burst
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._stamp) * self._rate
+        )
+        self._stamp = now
+
+    async def acquire(self) -> None:
+        """Wait until the budget allows another request."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class PollStats:
+    """Count how many polls each finished run needed."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.polls = 0
+        self.runs = 0
+        self.max_polls = 0
+
+    def record(self, polls: int) -> None:
+        """Record the poll count of a finished run."""
+        self.polls += polls
+        self.runs += 1
+        self.max_polls = max(self.max_polls, polls)
+
+    @property
+    def polls_per_run(self) -> float:
+        """Get the mean number of polls per finished run."""
+        return self.polls / self.runs if self.runs else 0.0
+
+    def snapshot(self) -> dict:
+        """Get the current counters."""
+        return {
+            "polls": self.polls,
+            "runs": self.runs,
+            "max_polls": self.max_polls,
+            "polls_per_run": self.polls_per_run,
+        }
+
+
+POLL_BUDGET = Budget(config.POLL_RATE_LIMIT)
+POLL_STATS = PollStats()
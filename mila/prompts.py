@@ -1,7 +1,47 @@
 """Provide prompts for Mila."""
 
+import os
+import string
+import time
 
-from mila.config import DESCRIPTION, NAME, PROMPT_PATH
+from mila.config import DESCRIPTION, NAME, PROMPT_PATH, PROMPT_RELOAD_INTERVAL
+
+_FORMATTER = string.Formatter()
+
+
+class Template:
+    """Represent a prompt with its global fields already substituted."""
+
+    def __init__(self, text: str, global_subs: dict):
+        """Compile the template."""
+        self._segments = []
+        literal = ""
+        for prefix, field, spec, conversion in _FORMATTER.parse(text):
+            literal += prefix
+            if field is None:
+                continue
+            if field in global_subs:
+                literal += self._field(global_subs[field], spec, conversion)
+            else:
+                self._segments.append((literal, field, spec, conversion))
+                literal = ""
+        self._tail = literal
+
+    @staticmethod
+    def _field(value, spec: str, conversion: str) -> str:
+        """Format a single substituted field."""
+        return _FORMATTER.format_field(
+            _FORMATTER.convert_field(value, conversion), spec
+        )
+
+    def render(self, sub_dict: dict) -> str:
+        """Fill in the remaining fields."""
+        parts = []
+        for literal, field, spec, conversion in self._segments:
+            parts.append(literal)
+            parts.append(self._field(sub_dict[field], spec, conversion))
+        parts.append(self._tail)
+        return "".join(parts)
 
 
 class Prompts:
@@ -12,19 +52,41 @@ class Prompts:
         "description": DESCRIPTION,
     }
 
+    def __init__(self):
+        """Initialize the prompt library."""
+        # Map each name to its file's mtime, its template and when the
+        # file was last checked.
+        self._templates = {}
+
     def __getitem__(self, name: str) -> str:
         """Get a prompt by name."""
-        return self._load_prompt(name).format(**self._global_subs)
+        return self._load_prompt(name).render({})
 
-    def _load_prompt(self, name: str) -> str:
-        """Read a prompt file."""
-        with open(f"{PROMPT_PATH}{name}.txt", "r", encoding="utf-8") as file:
-            return file.read().strip()
+    def _load_prompt(self, name: str) -> Template:
+        """Get a compiled prompt, rereading its file only if it changed."""
+        now = time.monotonic()
+        cached = self._templates.get(name)
+        if cached and now - cached[2] < PROMPT_RELOAD_INTERVAL:
+            return cached[1]
+        path = f"{PROMPT_PATH}{name}.txt"
+        mtime = os.stat(path).st_mtime_ns
+        if cached and cached[0] == mtime:
+            template = cached[1]
+        else:
+            with open(path, "r", encoding="utf-8") as file:
+                template = Template(file.read().strip(), self._global_subs)
+        self._templates[name] = (mtime, template, now)
+        return template
 
     def format(self, name: str, sub_dict: dict) -> str:
         """Get a prompt by name and format it."""
-        sub_dict.update(self._global_subs)
-        return self._load_prompt(name).format(**sub_dict)
+        return self._load_prompt(name).render(sub_dict)
+
+    def preload(self) -> None:
+        """Compile every prompt file ahead of use."""
+        for filename in os.listdir(PROMPT_PATH):
+            if filename.endswith(".txt"):
+                self._load_prompt(filename[: -len(".txt")])
 
 
 PROMPTS = Prompts()
@@ -0,0 +1,176 @@
+"""Provide pacing of OpenAI calls by their rate-limit headers."""
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+
+from mila import config
+from mila.logging import get_logger
+
+LOGGER = get_logger("ratelimit")
+
+DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+# Lower goes first: new work ahead of polls, and polls ahead of cleanup.
+PRIORITIES = {"POST": 0, "GET": 1, "DELETE": 2}
+
+
+def parse_duration(text: str) -> float:
+    """Convert a reset duration such as "6m0s" or "20ms" to seconds."""
+    return sum(
+        float(value) * UNITS[unit] for value, unit in DURATION.findall(text)
+    )
+
+
+class Bucket:
+    """Mirror one of OpenAI's rate limits as a token bucket."""
+
+    def __init__(self, kind: str, reserve: int):
+        """Initialize the bucket for "requests" or "tokens"."""
+        self._kind = kind
+        self._reserve = reserve
+        self._rate = 0.0
+        self._stamp = time.monotonic()
+        self.limit = None  # Unknown until the first response.
+        self.remaining = 0.0
+
+    def _refill(self) -> None:
+        """Add what the limit has regained since the last refill."""
+        now = time.monotonic()
+        self.remaining = min(
+            self.limit, self.remaining + (now - self._stamp) * self._rate
+        )
+        self._stamp = now
+
+    def delay(self) -> float:
+        """Get how long to wait before the bucket can afford a call."""
+        if self.limit is None:
+            return 0.0
+        self._refill()
+        shortfall = self._reserve + 1 - self.remaining
+        return shortfall / self._rate if shortfall > 0 else 0.0
+
+    def spend(self) -> None:
+        """Count a call against the bucket."""
+        if self.limit is not None:
+            self.remaining -= 1
+
+    def update(self, headers) -> None:
+        """Resynchronize the bucket with a response's headers."""
+        limit = headers.get(f"x-ratelimit-limit-{self._kind}")
+        remaining = headers.get(f"x-ratelimit-remaining-{self._kind}")
+        if limit is None or remaining is None:
+            return
+        self.limit = int(limit)
+        self.remaining = float(remaining)
+        self._stamp = time.monotonic()
+        reset = parse_duration(
+            headers.get(f"x-ratelimit-reset-{self._kind}", "")
+        )
+        if reset and self.remaining < self.limit:
+            self._rate = (self.limit - self.remaining) / reset
+        else:
+            # OpenAI's limits are per minute.
+            self._rate = max(self.limit, 1) / 60
+
+    def snapshot(self) -> dict:
+        """Get the bucket's current headroom."""
+        if self.limit is None:
+            return {"limit": None, "remaining": None}
+        self._refill()
+        return {"limit": self.limit, "remaining": int(self.remaining)}
+
+
+class RateLimiter:
+    """Hold OpenAI calls back, by priority, until the limits allow them."""
+
+    def __init__(
+        self,
+        request_reserve: int = config.RATE_LIMIT_REQUEST_RESERVE,
+        token_reserve: int = config.RATE_LIMIT_TOKEN_RESERVE,
+    ):
+        """Initialize the rate limiter."""
+        self._buckets = {
+            "requests": Bucket("requests", request_reserve),
+            "tokens": Bucket("tokens", token_reserve),
+        }
+        self._waiting = []  # A heap of (priority, order, future).
+        self._order = itertools.count()
+        self._blocked_until = 0.0
+        self._timer = None
+        self.delayed = 0
+        self.throttled = 0
+
+    def _delay(self) -> float:
+        """Get how long to wait before the next call may be made."""
+        return max(
+            self._blocked_until - time.monotonic(),
+            *(bucket.delay() for bucket in self._buckets.values()),
+        )
+
+    def _dispatch(self) -> None:
+        """Release waiting calls, highest priority first, while allowed."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting:
+            delay = self._delay()
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(
+                    delay, self._dispatch
+                )
+                return
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():  # The caller may have given up.
+                self._buckets["requests"].spend()
+                future.set_result(None)
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until a call of the given priority may be made."""
+        if not self._waiting and self._delay() <= 0:
+            self._buckets["requests"].spend()
+            return
+        self.delayed += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._order), future))
+        self._dispatch()
+        await future
+
+    async def on_request(self, request) -> None:
+        """Pace an outgoing HTTP request."""
+        await self.acquire(PRIORITIES.get(request.method, 1))
+
+    async def on_response(self, response) -> None:
+        """Learn the current limits from an HTTP response."""
+        for bucket in self._buckets.values():
+            bucket.update(response.headers)
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers["retry-after"])
+            except (KeyError, ValueError):
+                retry_after = config.RATE_LIMIT_RETRY
+            LOGGER.warning(
+                "OpenAI rate limit hit; holding for %ss.", retry_after
+            )
+            self.throttled += 1
+            self._blocked_until = time.monotonic() + retry_after
+        if self._waiting:
+            self._dispatch()
+
+    def snapshot(self) -> dict:
+        """Get the current headroom and pacing counters."""
+        return {
+            **{
+                kind: bucket.snapshot()
+                for kind, bucket in self._buckets.items()
+            },
+            "waiting": len(self._waiting),
+            "delayed": self.delayed,
+            "throttled": self.throttled,
+        }
+
+
+RATE_LIMITER = RateLimiter()
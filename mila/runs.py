@@ -1,11 +1,18 @@
 """Provide access to the OpenAI Runs feature."""
 
+import asyncio
 import json
 
+from mila import config
 from mila.llm import LLM
-from mila.logging import LOGGER
+from mila.logging import get_logger
+from mila.metrics import METRICS
+from mila.polling import POLL_BUDGET, POLL_STATS, Backoff
 from mila.tools import TOOLS
 
+LOGGER = get_logger("runs")
+FAILED = ["cancelled", "expired", "failed"]
+
 
 class Run:
     """Provide an abstraction for the OpenAI Runs API."""
@@ -14,77 +21,146 @@ class Run:
         self,
         thread_id: str,
         assistant_id: str,
+        message: dict,
     ):
-        """Initialize the Run."""
+        """Initialize the Run, which posts message to a thread.
+
+        If thread_id is None, the thread is created along with the run.
+        """
         self._thread_id = thread_id
         self._assistant_id = assistant_id
+        self._message = message
         self._run = None
+        self._status = None
+        self._polls = 0
+        self._backoff = Backoff()
+
+    async def _create(self, **kwargs):
+        """Post the message and start the run, in a single call."""
+        with METRICS.span("spawn_run"):
+            if self._thread_id:
+                return await LLM.beta.threads.runs.create(
+                    thread_id=self._thread_id,
+                    assistant_id=self._assistant_id,
+                    additional_messages=[self._message],
+                    **kwargs,
+                )
+            return await LLM.beta.threads.create_and_run(
+                assistant_id=self._assistant_id,
+                thread={"messages": [self._message]},
+                **kwargs,
+            )
 
     async def _spawn_run(self):
         """Spawn a new run."""
-        self._run = await LLM.beta.threads.runs.create(
-            thread_id=self._thread_id,
-            assistant_id=self._assistant_id,
-        )
+        self._run = await self._create()
+        self._thread_id = self._run.thread_id
 
     async def _update(self):
         """Update the run."""
         if not self._run:
             await self._spawn_run()
         else:
-            self._run = await LLM.beta.threads.runs.retrieve(
-                thread_id=self._thread_id,
-                run_id=self._run.id,
-            )
+            await POLL_BUDGET.acquire()
+            self._polls += 1
+            with METRICS.span("poll"):
+                self._run = await LLM.beta.threads.runs.retrieve(
+                    thread_id=self._thread_id,
+                    run_id=self._run.id,
+                )
+        LOGGER.debug("Run %s is %s.", self._run.id, self._run.status)
+        if self._run.status != self._status:
+            # Something happened; look again soon.
+            self._status = self._run.status
+            self._backoff.reset()
+
+    async def _call_tool(self, tool_call) -> dict:
+        """Call a single tool, reporting any failure as its output."""
+        name = tool_call.function.name
+        function = TOOLS.get(name)
+        timeout = getattr(function, "timeout", config.TOOL_TIMEOUT)
+        try:
+            arguments = json.loads(tool_call.function.arguments)
+            TOOLS.validate(name, arguments)
+        except ValueError as err:
+            LOGGER.error("Invalid arguments for %s: %s", name, err)
+            return {
+                "tool_call_id": tool_call.id,
+                "output": json.dumps({"error": f"Invalid arguments: {err}"}),
+            }
+        try:
+            with METRICS.span("tool", tool=name):
+                output = await asyncio.wait_for(function(**arguments), timeout)
+        except asyncio.TimeoutError:
+            err = f"{name} timed out after {timeout} seconds."
+            LOGGER.error(err)
+            output = json.dumps({"error": err})
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.exception("Tool %s failed.", name)
+            output = json.dumps({"error": f"{name} failed: {err}"})
+        return {
+            "tool_call_id": tool_call.id,
+            "output": output,
+        }
+
+    async def _call_tools(self, tool_calls: list) -> list:
+        """Call a turn's tools concurrently, within the run's deadline."""
+        tasks = {
+            asyncio.create_task(self._call_tool(tool_call)): tool_call
+            for tool_call in tool_calls
+        }
+        done, pending = await asyncio.wait(
+            tasks, timeout=config.TOOL_RUN_TIMEOUT
+        )
+        for task in pending:
+            task.cancel()
+        tool_outputs = []
+        for task, tool_call in tasks.items():
+            if task in done:
+                tool_outputs.append(task.result())
+            else:
+                err = (
+                    f"{tool_call.function.name} did not finish within this"
+                    f" turn's {config.TOOL_RUN_TIMEOUT} second deadline."
+                )
+                LOGGER.error(err)
+                tool_outputs.append(
+                    {
+                        "tool_call_id": tool_call.id,
+                        "output": json.dumps({"error": err}),
+                    }
+                )
+        return tool_outputs
+
+    def _tools_defined(self, tool_calls: list) -> bool:
+        """Check that every requested tool exists."""
+        defined = True
+        for tool_call in tool_calls:
+            if tool_call.function.name not in TOOLS:
+                LOGGER.error("Undefined tool: %s", tool_call.function.name)
+                defined = False
+        return defined
 
     async def check(self) -> bool:
         """Check whether a query run is complete."""
         await self._update()
         complete = False
         if self._run.status == "completed":
-            LOGGER.info("Run completed.")
+            LOGGER.info("Run completed after %d polls.", self._polls)
+            POLL_STATS.record(self._polls)
             complete = True
-        elif self._run.status in [
-            "cancelled",
-            "expired",
-            "failed",
-        ]:
+        elif self._run.status in FAILED:
             LOGGER.error("Run failed: %s", self._run.status)
+            POLL_STATS.record(self._polls)
             complete = True
         elif self._run.status == "requires_action":
-            tool_outputs = []
             LOGGER.info("Run requires action.")
-            for (
-                tool_call
-            ) in self._run.required_action.submit_tool_outputs.tool_calls:
-                arguments = json.loads(tool_call.function.arguments)
-                name = tool_call.function.name
-                found = False
-                for tool in TOOLS.definitions:
-                    if tool["function"]["name"] == name:
-                        found = True
-                        function = TOOLS.get(name)
-                        if function:
-                            response = await function(
-                                **arguments,
-                            )
-                            tool_call_id = tool_call.id
-                            tool_outputs.append(
-                                {
-                                    "tool_call_id": tool_call_id,
-                                    "output": response,
-                                }
-                            )
-                        else:
-                            LOGGER.error(
-                                "Undefined function: %s",
-                                name,
-                            )
-                            complete = True
-                if not found:
-                    LOGGER.error("Undefined tool: %s", name)
-                    complete = True
-            if tool_outputs:
+            tool_calls = (
+                self._run.required_action.submit_tool_outputs.tool_calls
+            )
+            complete = not self._tools_defined(tool_calls)
+            if not complete:
+                tool_outputs = await self._call_tools(tool_calls)
                 LOGGER.info("Submitting tool outputs.")
                 self._run = await LLM.beta.threads.runs.submit_tool_outputs(
                     thread_id=self._thread_id,
@@ -93,24 +169,88 @@ class Run:
                 )
         return complete
 
+    async def wait(self) -> None:
+        """Wait until the run is due to be checked again."""
+        await asyncio.sleep(self._backoff.next())
+
     async def id(self) -> str:
-        """Get the ID of the run."""
-        await self._update()
+        """Get the ID of the run, spawning it if need be."""
+        if not self._run:
+            await self._update()
         return self._run.id
 
+    @property
+    def thread_id(self) -> str:
+        """Get the ID of the run's thread, or None if not yet known."""
+        return self._thread_id
+
     async def response(self) -> str:
         """Get the response of the run."""
-        await self._update()
+        with METRICS.span("response"):
+            # check() has usually seen the final state already; don't
+            # spend a poll from the shared budget to see it again.
+            if not self._run or self._run.status not in ["completed", *FAILED]:
+                await self._update()
+            return await self._result()
+
+    async def _result(self, text: str = "") -> str:
+        """Turn the run's final state into a response."""
         return_value = ""
-        if self._run.status in ["cancelled", "expired", "failed"]:
+        if self._run.status in FAILED:
             LOGGER.error("Run failed: %s", self._run.status)
             return_value = f"Run error: {self._run.status}"
         elif self._run.status == "requires_action":
             LOGGER.error("Error in LLM function call.")
             return_value = "Error in LLM function call."
+        elif text:
+            return_value = text
         else:
             messages = await LLM.beta.threads.messages.list(
                 thread_id=self._thread_id,
+                run_id=self._run.id,
             )
             return_value = messages.data[0].content[0].text.value
         return return_value
+
+    async def stream(self):
+        """Run with streaming, yielding the response text as it grows.
+
+        Tool calls are answered inline, and the final value yielded is
+        the complete response.
+        """
+        text = ""
+        events = await self._create(stream=True)
+        while events is not None:
+            stream, events = events, None
+            async for event in stream:
+                if event.event == "thread.message.delta":
+                    for part in event.data.delta.content or []:
+                        if part.type == "text" and part.text.value:
+                            text += part.text.value
+                            yield text
+                elif event.event == "error":
+                    LOGGER.error("Run stream error: %s", event.data)
+                elif event.event.startswith(
+                    "thread.run."
+                ) and not event.event.startswith("thread.run.step."):
+                    self._run = event.data
+                    self._thread_id = self._run.thread_id
+                    if event.event == "thread.run.requires_action":
+                        events = await self._stream_tool_outputs()
+        LOGGER.info("Run streamed: %s", self._run.status)
+        yield await self._result(text)
+
+    async def _stream_tool_outputs(self):
+        """Answer a streamed run's tool calls and continue the stream."""
+        LOGGER.info("Run requires action.")
+        tool_calls = self._run.required_action.submit_tool_outputs.tool_calls
+        if not self._tools_defined(tool_calls):
+            return None
+        tool_outputs = await self._call_tools(tool_calls)
+        LOGGER.info("Submitting tool outputs.")
+        return await LLM.beta.threads.runs.submit_tool_outputs(
+            thread_id=self._thread_id,
+            run_id=self._run.id,
+            tool_outputs=tool_outputs,
+            stream=True,
+        )
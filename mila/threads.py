@@ -1,6 +1,5 @@
 """Provide access to the OpenAI Threads feature."""
 
-from mila.llm import LLM
 from mila.prompts import PROMPTS
 from mila.runs import Run
 
@@ -13,45 +12,49 @@ class Thread:
         assistant_id: str,
         context: str,
         query: str,
+        thread_id: str = None,
     ):
-        """Initialize the Thread."""
-        self._thread = None
-        self._run = None
-        self._assistant_id = assistant_id
-        self._context = context
-        self._query = query
-
-    async def _spawn_thread(self):
-        """Spawn a new thread."""
-        self._thread = await LLM.beta.threads.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": PROMPTS.format(
-                        name="user",
-                        sub_dict={
-                            "context": self._context,
-                            "query": self._query,
-                        },
-                    ),
-                }
-            ],
-        )
+        """Initialize the Thread, optionally continuing an existing one."""
+        message = {
+            "role": "user",
+            "content": PROMPTS.format(
+                name="user",
+                sub_dict={
+                    "context": context,
+                    "query": query,
+                },
+            ),
+        }
+        # The run posts the message, and creates the thread if need be.
         self._run = Run(
-            thread_id=self._thread.id,
-            assistant_id=self._assistant_id,
+            thread_id=thread_id,
+            assistant_id=assistant_id,
+            message=message,
         )
 
     async def id(self) -> str:
-        """Get the ID of the thread."""
-        if not self._thread:
-            await self._spawn_thread()
-        return self._thread.id
+        """Get the ID of the thread, starting its run if need be."""
+        await self._run.id()
+        return self._run.thread_id
+
+    @property
+    def thread_id(self) -> str:
+        """Get the ID of the thread, or None if it was never spawned."""
+        return self._run.thread_id
 
     async def check(self) -> bool:
         """Check whether a query run is complete."""
         return await self._run.check()
 
+    async def stream(self):
+        """Stream a run, yielding the response text as it grows."""
+        async for text in self._run.stream():
+            yield text
+
+    async def wait(self) -> None:
+        """Wait until the run is due to be checked again."""
+        await self._run.wait()
+
     async def response(self) -> str:
         """Retrieve the final response from a given run."""
         return await self._run.response()
@@ -1,14 +1,29 @@
 """Provide a suite of tools for the toolkit."""
 
-from mila.tools import fun, info, util
+import importlib
+import inspect
+import json
+
+from mila.tools.cache import TOOL_CACHE
+from mila.tools.compaction import COMPACTION
 
 _TOOLKITS = [
-    # Add toolkit libraries here.
-    fun,
-    info,
-    util,
+    # Add toolkit libraries here; each is imported when tools are needed.
+    "mila.tools.fun",
+    "mila.tools.info",
+    "mila.tools.util",
 ]
 
+# Map JSON schema types onto the Python types that json.loads produces.
+_TYPES = {
+    "array": list,
+    "boolean": bool,
+    "integer": int,
+    "number": (int, float),
+    "object": dict,
+    "string": str,
+}
+
 
 class Tool:
     """Represent a single tool in Mila's toolset."""
@@ -16,53 +31,152 @@ class Tool:
     def __init__(self, tool: callable):
         """Initialize the tool."""
         self._tool = tool
-
-    @property
-    def definition(self) -> dict:
-        """Get the tool definition."""
-        return {
+        # Compact before caching, so the cache holds the smaller results.
+        function = COMPACTION.wrap(tool)
+        self._function = (
+            TOOL_CACHE.wrap(function)
+            if hasattr(tool, "cache_ttl")
+            else function
+        )
+        self._check()
+        self._types = {
+            arg: _TYPES[schema["type"]]
+            for arg, schema in tool.properties.items()
+        }
+        self._required = frozenset(tool.required)
+        self._definition = {
             "type": "function",
             "function": {
-                "name": self._tool.__name__,
-                "description": self._tool.__doc__,
+                "name": self.name,
+                "description": tool.__doc__,
                 "parameters": {
                     "type": "object",
-                    "properties": self._tool.properties,
-                    "required": self._tool.required,
+                    "properties": tool.properties,
+                    "required": tool.required,
                 },
             },
         }
 
+    def _check(self) -> None:
+        """Ensure the tool's declared schema matches its signature."""
+        parameters = inspect.signature(self._tool).parameters
+        properties = self._tool.properties
+        problems = []
+        for arg in self._tool.required:
+            if arg not in properties:
+                problems.append(f"requires undeclared parameter {arg}")
+        for arg, parameter in parameters.items():
+            if arg not in properties:
+                problems.append(f"does not declare parameter {arg}")
+            elif (
+                parameter.default is parameter.empty
+                and arg not in self._tool.required
+            ):
+                problems.append(f"does not require parameter {arg}")
+        for arg, schema in properties.items():
+            if arg not in parameters:
+                problems.append(f"declares unknown parameter {arg}")
+            if schema.get("type") not in _TYPES:
+                problems.append(f"declares parameter {arg} with a bad type")
+        if problems:
+            raise ValueError(f"Tool {self.name} {', '.join(problems)}.")
+
+    @property
+    def definition(self) -> dict:
+        """Get the tool definition."""
+        return self._definition
+
     @property
     def function(self) -> callable:
         """Get the tool function."""
-        return self._tool
+        return self._function
+
+    @property
+    def name(self) -> str:
+        """Get the tool name."""
+        return self._tool.__name__
+
+    def validate(self, arguments: dict) -> None:
+        """Ensure a call's arguments match the tool's schema."""
+        if not isinstance(arguments, dict):
+            raise ValueError("Arguments must be a JSON object.")
+        missing = self._required.difference(arguments)
+        if missing:
+            raise ValueError(
+                f"Missing required arguments: {', '.join(sorted(missing))}."
+            )
+        for arg, value in arguments.items():
+            expected = self._types.get(arg)
+            if expected is None:
+                raise ValueError(f"Unexpected argument: {arg}.")
+            if not isinstance(value, expected) or (
+                isinstance(value, bool) and expected is not bool
+            ):
+                raise ValueError(
+                    f"Argument {arg} must be of type"
+                    f" {self._tool.properties[arg]['type']}."
+                )
 
 
 class Tools:
     """Represent Mila's available toolset."""
 
     def __init__(self, toolkits: list):
-        """Initialize the toolset."""
-        self._tools = [
-            Tool(getattr(toolkit, item))
-            for toolkit in toolkits
-            for item in dir(toolkit)
-            if callable(getattr(toolkit, item))
-            and hasattr(getattr(toolkit, item), "properties")
-        ]
+        """Initialize the toolset, given its toolkits' module names."""
+        self._toolkits = toolkits
+        self._tools = None
+        self._definitions = None
+        self._serialized = None
+
+    def _ready(self) -> None:
+        """Import the toolkits and collect their tools, once."""
+        if self._tools is not None:
+            return
+        tools = {}
+        for toolkit in map(importlib.import_module, self._toolkits):
+            for item in dir(toolkit):
+                if callable(getattr(toolkit, item)) and hasattr(
+                    getattr(toolkit, item), "properties"
+                ):
+                    tool = Tool(getattr(toolkit, item))
+                    if tool.name in tools:
+                        raise ValueError(
+                            f"More than one tool is named {tool.name}."
+                        )
+                    tools[tool.name] = tool
+        self._definitions = tuple(tool.definition for tool in tools.values())
+        self._serialized = json.dumps(self._definitions)
+        self._tools = tools
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a tool exists."""
+        self._ready()
+        return name in self._tools
 
     @property
-    def definitions(self) -> list:
+    def definitions(self) -> tuple:
         """Get the tool definitions."""
-        return [tool.definition for tool in self._tools]
+        self._ready()
+        return self._definitions
+
+    @property
+    def serialized(self) -> str:
+        """Get the tool definitions as JSON."""
+        self._ready()
+        return self._serialized
 
     def get(self, name: str) -> callable:
         """Get a tool by name."""
-        for tool in self._tools:
-            if tool.definition["function"]["name"] == name:
-                return tool.function
-        raise ValueError(f"No tool named {name} exists.")
+        self._ready()
+        try:
+            return self._tools[name].function
+        except KeyError as err:
+            raise ValueError(f"No tool named {name} exists.") from err
+
+    def validate(self, name: str, arguments: dict) -> None:
+        """Ensure a call's arguments match the named tool's schema."""
+        self._ready()
+        self._tools[name].validate(arguments)
 
 
 TOOLS = Tools(
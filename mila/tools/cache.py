@@ -0,0 +1,105 @@
+"""Provide a memoization layer for tool results."""
+
+import asyncio
+import functools
+import inspect
+import json
+import time
+from collections import OrderedDict
+
+from mila import config
+
+
+def _normalize(value):
+    """Fold trivially different arguments onto the same cache key."""
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+class ToolCache:
+    """Cache tool results with per-tool TTLs and request coalescing."""
+
+    def __init__(self, size: int = config.TOOL_CACHE_SIZE):
+        """Initialize the cache."""
+        self._size = size
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._stats = {}
+
+    def _store(self, key: str, name: str, value, ttl: float) -> None:
+        """Store a result, evicting the least recently used if full."""
+        self._entries[key] = (time.monotonic() + ttl, name, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._size:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._stats[evicted]["evictions"] += 1
+
+    async def _fill(self, key: str, tool: callable, args, kwargs):
+        """Call the tool once on behalf of every waiting caller."""
+        try:
+            value = await tool(*args, **kwargs)
+            self._store(key, tool.__name__, value, tool.cache_ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def wrap(self, tool: callable) -> callable:
+        """Memoize a coroutine function for its cache_ttl, in seconds."""
+        name = tool.__name__
+        signature = inspect.signature(tool)
+        counters = self._stats.setdefault(
+            name,
+            {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0},
+        )
+
+        @functools.wraps(tool)
+        async def cached(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = json.dumps(
+                [
+                    name,
+                    {
+                        arg: _normalize(value)
+                        for arg, value in bound.arguments.items()
+                    },
+                ],
+                sort_keys=True,
+            )
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                counters["hits"] += 1
+                return entry[2]
+            task = self._inflight.get(key)
+            if task:
+                counters["coalesced"] += 1
+            else:
+                counters["misses"] += 1
+                task = asyncio.ensure_future(
+                    self._fill(key, tool, args, kwargs)
+                )
+                # Nobody may be left waiting if every caller timed out.
+                task.add_done_callback(
+                    lambda done: done.cancelled() or done.exception()
+                )
+                self._inflight[key] = task
+            # Shield the shared call, so one caller's timeout cannot
+            # cancel it for the others.
+            return await asyncio.shield(task)
+
+        return cached
+
+    def snapshot(self) -> dict:
+        """Get hit and miss counters for each cached tool."""
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "tools": {
+                name: dict(counters) for name, counters in self._stats.items()
+            },
+        }
+
+
+TOOL_CACHE = ToolCache()
@@ -0,0 +1,113 @@
+"""Provide a local, indexed catalog of ImgFlip's meme templates."""
+
+import asyncio
+import time
+
+from mila import config
+from mila.logging import get_logger
+from mila.tools.client import HTTP
+
+LOGGER = get_logger("tools")
+
+
+class MemeCatalog:
+    """Keep ImgFlip's templates in memory, indexed by box count.
+
+    The catalog loads on first use and, once started, reloads in the
+    background; lookups never wait on the network after the first load.
+    """
+
+    def __init__(self, refresh: float = config.MEME_CATALOG_REFRESH):
+        """Initialize the catalog."""
+        self._refresh = refresh
+        self._boxes = {}  # box_count -> [(lowercase name, template)]
+        self._loading = None
+        self._task = None
+        self.refreshed = None
+        self.refreshes = 0
+        self.failures = 0
+
+    async def _fetch(self) -> None:
+        """Download the templates and rebuild the index."""
+        try:
+            async with HTTP.session.get(
+                f"{config.IMGFLIP_URL}/get_memes"
+            ) as response:
+                memes = (await response.json())["data"]["memes"]
+        except Exception:
+            self.failures += 1
+            raise
+        boxes = {}
+        for meme in memes:
+            boxes.setdefault(meme["box_count"], []).append(
+                (
+                    meme["name"].lower(),
+                    {
+                        "id": meme["id"],
+                        "name": meme["name"],
+                        "box_count": meme["box_count"],
+                    },
+                )
+            )
+        # Swap the whole index at once, so lookups never see half of it.
+        self._boxes = boxes
+        self.refreshed = time.monotonic()
+        self.refreshes += 1
+
+    async def load(self) -> None:
+        """Load the templates, sharing one download between callers."""
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._fetch())
+        loading = self._loading
+        try:
+            await asyncio.shield(loading)
+        finally:
+            if self._loading is loading and loading.done():
+                self._loading = None
+
+    async def _reload(self) -> None:
+        """Reload the templates periodically, retrying failures sooner."""
+        while True:
+            try:
+                await self.load()
+                delay = self._refresh
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                LOGGER.warning("Could not load meme templates: %s", err)
+                delay = config.MEME_CATALOG_RETRY
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """Start reloading the templates in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._reload())
+
+    async def close(self) -> None:
+        """Stop reloading the templates."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def search(self, box_count: int, keyword: str = "") -> list:
+        """Get the templates with box_count boxes whose names match."""
+        if not self._boxes:
+            await self.load()
+        words = keyword.lower().split()
+        return [
+            template
+            for name, template in self._boxes.get(box_count, [])
+            if all(word in name for word in words)
+        ]
+
+    def snapshot(self) -> dict:
+        """Get the catalog's size and freshness."""
+        return {
+            "templates": sum(map(len, self._boxes.values())),
+            "age": (
+                time.monotonic() - self.refreshed if self.refreshed else None
+            ),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+
+MEME_CATALOG = MemeCatalog()
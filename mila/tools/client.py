@@ -0,0 +1,94 @@
+"""Provide a shared, pooled HTTP client for Mila's tools."""
+
+# aiohttp is imported on first use, to keep importing Mila fast.
+# pylint: disable=import-outside-toplevel
+
+from mila import config
+
+
+class HTTPClient:
+    """Share one connection pool between every tool."""
+
+    def __init__(self):
+        """Initialize the client."""
+        self._session = None
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    async def _on_request_start(self, *_) -> None:
+        """Count an outgoing request."""
+        self.requests += 1
+
+    async def _on_connection_create_end(self, *_) -> None:
+        """Count a freshly opened connection."""
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, *_) -> None:
+        """Count a connection taken from the pool."""
+        self.connections_reused += 1
+
+    def _trace_config(self):
+        """Build the hooks that feed the pool metrics."""
+        import aiohttp
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(
+            self._on_connection_create_end
+        )
+        trace_config.on_connection_reuseconn.append(
+            self._on_connection_reuseconn
+        )
+        return trace_config
+
+    @property
+    def session(self):
+        """Get the shared aiohttp session, opening it on first use."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=config.HTTP_POOL_SIZE,
+                    limit_per_host=config.HTTP_POOL_PER_HOST,
+                    ttl_dns_cache=config.HTTP_DNS_TTL,
+                ),
+                timeout=aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT),
+                trace_configs=[self._trace_config()],
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def snapshot(self) -> dict:
+        """Get the current pool metrics."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": (
+                self.connections_reused / connections if connections else 0.0
+            ),
+        }
+
+
+def raise_for_status(response, service: str) -> None:
+    """Fail on an HTTP error, so its body is neither cached nor compacted.
+
+    Unlike aiohttp's own check, the message leaves out the URL, which may
+    hold an API key.
+    """
+    if response.status >= 400:
+        raise RuntimeError(
+            f"{service} answered with HTTP {response.status}"
+            f" {response.reason}."
+        )
+
+
+HTTP = HTTPClient()
@@ -0,0 +1,93 @@
+"""Provide a compaction stage that shrinks tool results for the model."""
+
+import functools
+import json
+
+from mila import config
+from mila.logging import get_logger
+from mila.tools.parsing import truncate
+
+LOGGER = get_logger("tools")
+
+
+def dump(value) -> str:
+    """Serialize a value as JSON, without insignificant whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def project(items: list, fields: tuple) -> list:
+    """Keep only the given fields of each item."""
+    return [
+        {field: item[field] for field in fields if field in item}
+        for item in items
+    ]
+
+
+def tokens(text: str) -> int:
+    """Estimate how many tokens a text costs the model."""
+    return -(-len(text) // config.TOOL_CHARS_PER_TOKEN)
+
+
+class Compaction:
+    """Compact and cap each tool's output, counting what it saves.
+
+    A tool may set a compact attribute, a function that turns its raw
+    output into a smaller one, and a max_chars attribute to override the
+    default cap on its output's size.
+    """
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._stats = {}
+
+    def _compact(self, tool: callable, output: str) -> str:
+        """Compact one output, keeping it as is if it cannot be parsed."""
+        compact = getattr(tool, "compact", None)
+        if compact is not None:
+            try:
+                output = compact(output)
+            except (ValueError, KeyError, TypeError, AttributeError) as err:
+                LOGGER.warning(
+                    "Could not compact %s output: %s", tool.__name__, err
+                )
+        return truncate(
+            output, getattr(tool, "max_chars", config.TOOL_OUTPUT_MAX_CHARS)
+        )
+
+    def wrap(self, tool: callable) -> callable:
+        """Compact a tool function's output on its way to the model."""
+        counters = self._stats.setdefault(
+            tool.__name__,
+            {"calls": 0, "raw_tokens": 0, "tokens": 0, "truncated": 0},
+        )
+
+        @functools.wraps(tool)
+        async def compacted(*args, **kwargs):
+            raw = await tool(*args, **kwargs)
+            output = self._compact(tool, raw)
+            counters["calls"] += 1
+            counters["raw_tokens"] += tokens(raw)
+            counters["tokens"] += tokens(output)
+            counters["truncated"] += output.endswith("\n[truncated]")
+            return output
+
+        return compacted
+
+    def snapshot(self) -> dict:
+        """Get the tokens each tool's results cost, before and after."""
+        tools = {
+            name: {
+                **counters,
+                "tokens_saved": counters["raw_tokens"] - counters["tokens"],
+            }
+            for name, counters in self._stats.items()
+        }
+        return {
+            "tokens_saved": sum(
+                counters["tokens_saved"] for counters in tools.values()
+            ),
+            "tools": tools,
+        }
+
+
+COMPACTION = Compaction()
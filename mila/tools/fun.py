@@ -1,25 +1,28 @@
 """Provide a suite of fun tools."""
 
+import json
 import os
 import random
 
-import aiohttp
+from mila import config
+from mila.logging import get_logger
+from mila.tools.catalog import MEME_CATALOG
+from mila.tools.client import HTTP, raise_for_status
+from mila.tools.compaction import dump, project
 
-from mila.logging import LOGGER
+LOGGER = get_logger("tools")
 
 
 async def get_horoscope(star_sign: str) -> str:
     """Get the horoscope for a given star sign."""
-    base_url = "https://horoscope-app-api.vercel.app"
+    base_url = config.HOROSCOPE_URL
     path = "/api/v1/get-horoscope/daily"
     params = f"?sign={star_sign}&day=today"
     LOGGER.info("Function called: get_horoscope(star_sign='%s')", star_sign)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            base_url + path + params, timeout=5
-        ) as response:
-            return await response.text()
+    async with HTTP.session.get(base_url + path + params) as response:
+        raise_for_status(response, "The horoscope service")
+        return await response.text()
 
 
 get_horoscope.properties = {
@@ -29,41 +32,57 @@ get_horoscope.properties = {
     }
 }
 get_horoscope.required = ["star_sign"]
+get_horoscope.cache_ttl = 60 * 60
+
+
+def _compact_horoscope(output: str) -> str:
+    """Keep only a horoscope's date and text."""
+    horoscope = json.loads(output)
+    if "data" not in horoscope:
+        return output
+    return dump(
+        {
+            "date": horoscope["data"].get("date"),
+            "horoscope": horoscope["data"]["horoscope_data"],
+        }
+    )
+
+
+get_horoscope.compact = _compact_horoscope
+
 
+async def get_meme_templates(keyword: str = "") -> str:
+    """Get meme templates, optionally only those with a keyword in the name."""
+    LOGGER.info("Function called: get_meme_templates(keyword='%s')", keyword)
+    # get_meme fills in exactly two text boxes.
+    memes = await MEME_CATALOG.search(2, keyword)
+    if not keyword:
+        # There are far too many meme templates; this saves tokens.
+        memes = random.sample(memes, min(config.MEME_TEMPLATES, len(memes)))
+    return json.dumps(memes[: config.MEME_TEMPLATES])
 
-async def get_meme_templates() -> str:
-    """Get available meme templates."""
-    base_url = "https://api.imgflip.com"
-    path = "/get_memes"
-    LOGGER.info("Function called: get_meme_templates()")
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(base_url + path, timeout=5) as response:
-            data = await response.json()
-            # There are far too many meme templates; this saves tokens.
-            memes = random.sample(
-                [
-                    meme
-                    for meme in data["data"]["memes"]
-                    if meme["box_count"] == 2
-                ],
-                5,
-            )
-            return (
-                "Here are five possible templates, "
-                f"selected randomly:\n\n{memes}"
-            )
-
-
-get_meme_templates.properties = {}
+
+get_meme_templates.properties = {
+    "keyword": {
+        "type": "string",
+        "description": (
+            "Words to look for in template names, e.g. 'drake'."
+            " Omit for a random selection."
+        ),
+    }
+}
 get_meme_templates.required = []
+# The model needs only enough to pick a template and call get_meme.
+get_meme_templates.compact = lambda output: dump(
+    project(json.loads(output), ("id", "name"))
+)
 
 
 async def get_meme(template_id: int, text0: str, text1: str) -> str:
     """Get a meme from a template. Please make it funny."""
     username = os.getenv("IMGFLIP_USERNAME")
     password = os.getenv("IMGFLIP_PASSWORD")
-    base_url = "https://api.imgflip.com"
+    base_url = config.IMGFLIP_URL
     path = "/caption_image"
     params = {
         "template_id": template_id,
@@ -79,13 +98,9 @@ async def get_meme(template_id: int, text0: str, text1: str) -> str:
         text1,
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            base_url + path, data=params, timeout=5
-        ) as response:
-            meme = await response.json()
-            response = f"Here's your meme: {meme['data']['url']}"
-    return response
+    async with HTTP.session.post(base_url + path, data=params) as response:
+        meme = await response.json()
+    return f"Here's your meme: {meme['data']['url']}"
 
 
 get_meme.properties = {
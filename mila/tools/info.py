@@ -2,12 +2,17 @@
 
 import json
 import os
+import time
+from collections import Counter
 
-import aiohttp
-import serpapi
-from bs4 import BeautifulSoup
+from mila import config
+from mila.logging import clip, get_logger
+from mila.tools.client import HTTP, raise_for_status
+from mila.tools.compaction import dump, project
+from mila.tools.parsing import html_to_text, truncate
+from mila.tools.workers import WORKERS
 
-from mila.logging import LOGGER
+LOGGER = get_logger("tools")
 
 
 async def get_weather(zipcode: str) -> str:
@@ -24,13 +29,13 @@ async def get_weather(zipcode: str) -> str:
                 "error": err,
             }
         )
-    base_url = "https://api.openweathermap.org/data/2.5/forecast"
+    base_url = config.WEATHER_URL
     base_url += f"?zip={zipcode},us&appid={api_key}&units=imperial"
     LOGGER.info("Function called: get_weather(zipcode='%s')", zipcode)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(base_url, timeout=5) as response:
-            return await response.text()
+    async with HTTP.session.get(base_url) as response:
+        raise_for_status(response, "OpenWeatherMap")
+        return await response.text()
 
 
 get_weather.properties = {
@@ -40,24 +45,88 @@ get_weather.properties = {
     }
 }
 get_weather.required = ["zipcode"]
+get_weather.cache_ttl = 10 * 60
+
+
+def _compact_weather(output: str) -> str:
+    """Summarize a three-hourly forecast as one entry per day."""
+    forecast = json.loads(output)
+    if "list" not in forecast:
+        return output
+    offset = forecast.get("city", {}).get("timezone", 0)
+    days = {}
+    for entry in forecast["list"]:
+        date = time.strftime("%a %Y-%m-%d", time.gmtime(entry["dt"] + offset))
+        days.setdefault(date, []).append(entry)
+    summaries = []
+    for date, entries in days.items():
+        skies = Counter(
+            entry["weather"][0]["description"] for entry in entries
+        )
+        summaries.append(
+            {
+                "date": date,
+                "low_f": round(
+                    min(entry["main"]["temp_min"] for entry in entries)
+                ),
+                "high_f": round(
+                    max(entry["main"]["temp_max"] for entry in entries)
+                ),
+                "sky": skies.most_common(1)[0][0],
+                "rain_pct": round(
+                    max(entry.get("pop", 0) for entry in entries) * 100
+                ),
+                "wind_mph": round(
+                    max(entry["wind"]["speed"] for entry in entries)
+                ),
+            }
+        )
+    return dump(
+        {"city": forecast.get("city", {}).get("name"), "days": summaries}
+    )
+
+
+get_weather.compact = _compact_weather
 
 
 async def scrape_url(url: str) -> str:
     """Scrape a given URL for its text content."""
     LOGGER.info("Function called: scrape_url(url='%s')", url)
+    import aiohttp  # pylint: disable=import-outside-toplevel
+
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=5) as response:
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-                return soup.get_text()
+        async with HTTP.session.get(url) as response:
+            if response.content_type not in config.SCRAPE_CONTENT_TYPES:
+                err = f"Cannot scrape content of type {response.content_type}."
+                LOGGER.error(err)
+                return json.dumps(
+                    {
+                        "error": err,
+                    }
+                )
+            # Stream the body, so a huge page costs no more than the cap.
+            content = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                content += chunk
+                if len(content) >= config.SCRAPE_MAX_BYTES:
+                    break
+            encoding = response.charset
     except aiohttp.ClientError as err:
         LOGGER.error(err)
         return json.dumps(
             {
-                "error": err,
+                "error": str(err),
             }
         )
+    content = bytes(content[: config.SCRAPE_MAX_BYTES])
+    if response.content_type == "text/plain":
+        return truncate(
+            content.decode(encoding or "utf-8", errors="replace"),
+            config.SCRAPE_MAX_CHARS,
+        )
+    return await WORKERS.run(
+        html_to_text, content, encoding, config.SCRAPE_MAX_CHARS
+    )
 
 
 scrape_url.properties = {
@@ -83,16 +152,21 @@ async def search_duckduckgo(query: str) -> str:
                 "error": err,
             }
         )
-    LOGGER.info("Function called: search_duckduckgo(query='%s')", query)
-    client = serpapi.GoogleSearch(
-        {
+    LOGGER.info("Function called: search_duckduckgo(query='%s')", clip(query))
+    import aiohttp  # pylint: disable=import-outside-toplevel
+
+    # Query SerpApi's JSON endpoint directly; its client library blocks.
+    async with HTTP.session.get(
+        config.SEARCH_URL,
+        params={
             "engine": "duckduckgo",
             "q": query,
             "kl": "us-en",
             "api_key": api_key,
-        }
-    )
-    results = client.get_dict()
+        },
+        timeout=aiohttp.ClientTimeout(total=config.SEARCH_TIMEOUT),
+    ) as response:
+        results = await response.json()
     try:
         top_results = results["organic_results"][:10]  # top 10 results
     except KeyError:
@@ -104,16 +178,7 @@ async def search_duckduckgo(query: str) -> str:
                 "return_value": results,
             }
         )
-    formatted_results = [
-        # Compress to essentials.
-        {
-            "title": result["title"],
-            "link": result["link"],
-            "snippet": result["snippet"],
-        }
-        for result in top_results
-    ]
-    return json.dumps(formatted_results)
+    return json.dumps(top_results)
 
 
 search_duckduckgo.properties = {
@@ -123,3 +188,14 @@ search_duckduckgo.properties = {
     }
 }
 search_duckduckgo.required = ["query"]
+
+
+def _compact_results(output: str) -> str:
+    """Compress search results to their essentials."""
+    results = json.loads(output)
+    if not isinstance(results, list):
+        return output
+    return dump(project(results, ("title", "link", "snippet")))
+
+
+search_duckduckgo.compact = _compact_results
@@ -0,0 +1,24 @@
+"""Provide text extraction for fetched web pages."""
+
+import importlib.util
+
+# lxml is several times faster than the pure-Python parser.
+PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut text down to at most limit characters, marking the cut."""
+    if len(text) > limit:
+        text = text[:limit] + "\n[truncated]"
+    return text
+
+
+def html_to_text(content: bytes, encoding: str, limit: int) -> str:
+    """Extract at most limit characters of readable text from a page."""
+    # Imported here, in the worker process, rather than with Mila.
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+    soup = BeautifulSoup(content, PARSER, from_encoding=encoding)
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    return truncate(soup.get_text("\n", strip=True), limit)
@@ -1,6 +1,8 @@
 """Provide a suite of utility tools."""
 
-from mila.logging import LOGGER
+from mila.logging import get_logger
+
+LOGGER = get_logger("tools")
 
 
 async def suggest_feature(
@@ -24,7 +26,7 @@ suggest_feature.properties = {
         "description": "The function name for the suggested feature.",
     },
 }
-suggest_feature.required = ["feature", "category", "implementation"]
+suggest_feature.required = ["feature", "category"]
 
 
 async def submit_bug(
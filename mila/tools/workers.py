@@ -0,0 +1,51 @@
+"""Provide a worker pool for CPU-bound tool work."""
+
+import asyncio
+import concurrent.futures
+
+from mila import config
+from mila.logging import get_logger
+
+LOGGER = get_logger("tools")
+
+
+class Workers:
+    """Run CPU-bound work in worker processes, off the event loop."""
+
+    def __init__(self, size: int):
+        """Initialize the pool."""
+        self._size = size
+        self._pool = None
+
+    async def _submit(self, function: callable, *args):
+        """Run a function in the pool, starting the pool if need be."""
+        if self._pool is None:
+            # The executor loads multiprocessing only when first used.
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._size
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, function, *args
+        )
+
+    async def run(self, function: callable, *args):
+        """Run a picklable function in the pool and await its result.
+
+        If a worker process has died, the pool is replaced and the call
+        retried once.
+        """
+        try:
+            return await self._submit(function, *args)
+        except concurrent.futures.process.BrokenProcessPool:
+            LOGGER.warning("A worker process died; restarting the pool.")
+            self.shutdown()
+            return await self._submit(function, *args)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+WORKERS = Workers(config.TOOL_WORKERS)
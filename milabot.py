@@ -2,16 +2,25 @@
 
 """Launch Mila as a Discord bot."""
 
+import asyncio
+import json
 import os
+import re
 
 import discord
-from discord.ext import tasks
 
 from mila import Mila, config
-from mila.logging import LOGGER
+from mila.admission import Overloaded
+from mila.delivery import Outbox, chunk
+from mila.history import History
+from mila.logging import get_logger
+from mila.metrics import METRICS
 
+LOGGER = get_logger("bot")
+THINKING = "_Thinking..._"  # Placeholder shown until Mila responds.
 CONTEXT_LIMIT = 5  # How many previous Discord messages to include in context.
-TICK_TIME = 0.1  # How often to check for updates, in seconds.
+HISTORY_CHANNELS = 1000  # How many channels' recent messages to keep.
+MENTION = re.compile(r"<(@!?|@&|#)(\d+)>")  # User, role and channel mentions.
 
 
 class MilaBot(discord.Client):
@@ -21,77 +30,233 @@ class MilaBot(discord.Client):
         """Initialize MilaBot."""
         super().__init__(*args, **kwargs)
         self._mila = mila
-        self._threads = {}
-
-    @tasks.loop(seconds=TICK_TIME)
-    async def tick(self) -> None:
-        """Check for updates."""
-        for thread_id in list(self._threads.keys()):
-            if await self._mila.check_completion(thread_id):
-                response = await self._mila.get_response(thread_id)
-                if len(response) > 2000:
-                    # Response is too long for Discord. Split it into chunks,
-                    # but avoid splitting in the middle of a line.
-                    message = self._threads[thread_id]
-                    chunks = response.split("\n")
-                    response = ""
-                    for chunk in chunks:
-                        if len(response) + len(chunk) > 2000:
-                            await message.edit(content=response)
-                            message = await message.reply("_Responding..._")
-                            response = "(continued)\n"
-                        response += chunk + "\n"
-                    await message.edit(content=response)
+        self._requests = {}
+        self._history = History(CONTEXT_LIMIT, HISTORY_CHANNELS)
+        self._updates = {}
+        self._presenters = {}
+        self._outbox = Outbox()
+        self._delivery = None
+
+    async def close(self) -> None:
+        """Shut down delivery and Mila before disconnecting."""
+        if self._delivery:
+            self._delivery.cancel()
+        await self._mila.close()
+        await super().close()
+
+    async def deliver(self) -> None:
+        """Deliver responses as Mila produces them."""
+        async for request_id, response, final in self._mila.completions():
+            if request_id not in self._requests:
+                continue  # Delivery already failed, or was abandoned.
+            # Only the newest update matters; older ones are dropped.
+            self._updates[request_id] = (response, final)
+            if request_id not in self._presenters:
+                self._presenters[request_id] = asyncio.create_task(
+                    self._present(request_id)
+                )
+
+    async def _present(self, request_id: str) -> None:
+        """Show a request's updates in its placeholder, one at a time."""
+        done = False
+        try:
+            message = await self._requests[request_id]
+            while request_id in self._updates:
+                response, done = self._updates.pop(request_id)
+                if done:
+                    with METRICS.span("deliver"):
+                        await self._send(message, response)
                 else:
-                    await self._threads[thread_id].edit(content=response)
-                self._threads.pop(thread_id)
+                    preview = chunk(response)[0]
+                    with METRICS.span("edit"):
+                        await self._outbox.send(
+                            message.channel.id,
+                            [lambda _: message.edit(content=preview)],
+                        )
+        except discord.HTTPException as err:
+            # The placeholder may be gone, or the channel closed to us.
+            LOGGER.error("Could not deliver request %s: %s", request_id, err)
+            done = True
+        except BaseException:
+            done = True
+            raise
+        finally:
+            self._presenters.pop(request_id)
+            if done:
+                # deliver() drops any updates that arrive after this.
+                self._requests.pop(request_id, None)
+                self._updates.pop(request_id, None)
 
-    async def _get_context(self, message: discord.Message):
-        """Pull the message history and format it for Mila."""
-        chat_context = "\n".join(
-            [
-                f"> {msg.author.name}: {msg.content}"
-                async for msg in message.channel.history(limit=CONTEXT_LIMIT)
-            ][::-1]
+    async def _send(self, message: discord.Message, response: str) -> None:
+        """Replace a placeholder message with Mila's response."""
+        # Fill the placeholder, then reply to each chunk with the next.
+        chunks = chunk(response)
+        await self._outbox.send(
+            message.channel.id,
+            [lambda _: message.edit(content=chunks[0])]
+            + [
+                lambda previous, text=text: previous.reply(text)
+                for text in chunks[1:]
+            ],
         )
+
+    async def _is_admin(self, message: discord.Message) -> bool:
+        """Check whether a message's author may see Mila's stats."""
+        permissions = getattr(message.author, "guild_permissions", None)
+        if permissions is not None and permissions.administrator:
+            return True
+        info = await self.application_info()
+        return message.author.id == info.owner.id
+
+    async def _report_stats(self, message: discord.Message) -> None:
+        """Reply with Mila's latency summary and runtime counters."""
+        report = "\n".join(
+            METRICS.summary() + [json.dumps(self._mila.stats(), indent=1)]
+        )
+        chunks = chunk(f"```\n{report}\n```")
+        await self._outbox.send(
+            message.channel.id,
+            [lambda _: message.reply(chunks[0])]
+            + [
+                lambda previous, text=text: previous.reply(text)
+                for text in chunks[1:]
+            ],
+        )
+
+    async def _get_context(self, message: discord.Message) -> tuple:
+        """Describe where a message was sent, and pull the chat history.
+
+        The history is returned separately, as Mila only needs it when
+        the message starts a fresh thread.
+        """
         if message.guild:
             context = f"You in the {message.guild.name} Discord server. "
         else:
             context = "You are in a private Discord direct-message chat. "
-        context += (
+        channel = str(message.channel.id)
+        if channel not in self._history:
+            # Cold channel; backfill once, then follow gateway events.
+            # Our placeholder may already be posted; leave it out.
+            self._history.backfill(
+                channel,
+                [
+                    (msg.id, msg.author.name, msg.content)
+                    async for msg in message.channel.history(
+                        limit=CONTEXT_LIMIT + 1
+                    )
+                    if not (
+                        msg.author == self.user
+                        and msg.reference
+                        and msg.reference.message_id == message.id
+                    )
+                ][:CONTEXT_LIMIT][::-1],
+            )
+        chat_context = "\n".join(
+            f"> {author}: {content}"
+            for author, content in self._history.recent(channel)
+        )
+        recap = (
             f"Here are the last {CONTEXT_LIMIT} messages in the chat:\n\n"
             + chat_context
         )
-        return await self._sub_usernames(context)
+        return context, self._sub_mentions(recap, message.guild)
+
+    def _sub_mentions(self, text: str, guild: discord.Guild) -> str:
+        """Substitute names for user, role and channel mentions."""
 
-    async def _sub_usernames(self, message: str) -> str:
-        """Substitute Discord usernames for user IDs."""
-        for user in self.users:
-            message = message.replace(f"<@{user.id}>", user.name)
-        return message
+        def name(match: re.Match) -> str:
+            kind, snowflake = match.group(1), int(match.group(2))
+            if kind == "#":
+                channel = self.get_channel(snowflake)
+                return f"#{channel.name}" if channel else match.group(0)
+            if kind == "@&":
+                role = guild.get_role(snowflake) if guild else None
+                return f"@{role.name}" if role else match.group(0)
+            user = self.get_user(snowflake)
+            return user.name if user else match.group(0)
+
+        return MENTION.sub(name, text)
 
     async def on_message(self, message: discord.Message):
         """Respond to incoming messages."""
+        self._history.add(
+            str(message.channel.id),
+            message.id,
+            message.author.name,
+            message.content,
+        )
+        if (
+            message.content.strip() == config.STATS_COMMAND
+            and await self._is_admin(message)
+        ):
+            await self._report_stats(message)
+            return
         if message.author != self.user and (
             self.user.mentioned_in(message)
             or message.channel.type == discord.ChannelType.private
         ):
-            thread_id = await self._mila.handle_message(
-                author=message.author.id,
-                name=message.author.name,
-                query=await self._sub_usernames(message.content),
-                context=await self._get_context(message),
+            # Acknowledge at once; assemble the request meanwhile.
+            placeholder = asyncio.create_task(message.reply(THINKING))
+            try:
+                query = self._sub_mentions(message.content, message.guild)
+                context, recap = await self._get_context(message)
+                request_id = await self._mila.handle_message(
+                    author=message.author.id,
+                    name=message.author.name,
+                    query=query,
+                    context=context,
+                    recap=recap,
+                    channel=str(message.channel.id),
+                    guild=str(message.guild.id) if message.guild else None,
+                )
+            except Overloaded:
+                reply = config.OVERLOADED_REPLY
+            except Exception:  # pylint: disable=broad-exception-caught
+                LOGGER.exception("Could not handle message %s.", message.id)
+                reply = config.ERROR_REPLY
+            else:
+                # Register the placeholder before yielding, so a fast run
+                # can never complete before there is a message to deliver
+                # it to.
+                self._requests[request_id] = placeholder
+                return
+            try:
+                await self._send(await placeholder, reply)
+            except discord.HTTPException as err:
+                LOGGER.error("Could not reply to %s: %s", message.id, err)
+
+    async def on_raw_bulk_message_delete(
+        self, payload: discord.RawBulkMessageDeleteEvent
+    ) -> None:
+        """Forget deleted messages."""
+        for message_id in payload.message_ids:
+            self._history.delete(str(payload.channel_id), message_id)
+
+    async def on_raw_message_delete(
+        self, payload: discord.RawMessageDeleteEvent
+    ) -> None:
+        """Forget a deleted message."""
+        self._history.delete(str(payload.channel_id), payload.message_id)
+
+    async def on_raw_message_edit(
+        self, payload: discord.RawMessageUpdateEvent
+    ) -> None:
+        """Track an edited message."""
+        if "content" in payload.data:
+            self._history.edit(
+                str(payload.channel_id),
+                payload.message_id,
+                payload.data["content"],
             )
-            response = await message.reply("_Thinking..._")
-            self._threads[thread_id] = response
 
     async def on_ready(self) -> None:
         """Log a message when the bot is ready."""
         LOGGER.info("Logged in as %s.", self.user)
 
     async def setup_hook(self) -> None:
-        """Set up the bot's heartbeat."""
-        self.tick.start()
+        """Resolve Mila's assistant and start delivering responses."""
+        await self._mila.setup()
+        self._delivery = asyncio.create_task(self.deliver())
 
 
 def main():
@@ -105,11 +270,8 @@ def main():
         description=config.DESCRIPTION,
         intents=intents,
     )
-    bot.run(
-        os.getenv("DISCORD_TOKEN"),
-        log_handler=LOGGER.handlers[1],
-        log_formatter=LOGGER.handlers[1].formatter,
-    )
+    # discord.py's logs already go through Mila's queued handlers.
+    bot.run(os.getenv("DISCORD_TOKEN"), log_handler=None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+"""Test admission control."""
+
+import asyncio
+
+import pytest
+
+from mila.admission import Admission
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_dropped_from_line():
+    """Check that cancelling a queued request frees its place only."""
+    admission = Admission(limit=1)
+    running = admission.enqueue("alice", "guild", "mention")
+    queued = admission.enqueue("bob", "guild", "mention")
+    later = admission.enqueue("carol", "guild", "mention")
+
+    async def supervise(ticket):
+        """Wait for admission, releasing the ticket however it ends."""
+        try:
+            await ticket.granted
+        finally:
+            admission.release(ticket)
+
+    waiter = asyncio.create_task(supervise(queued))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    # The running request finishes before the cancelled waiter unwinds.
+    admission.release(running)
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert not queued.admitted
+    assert later.admitted
+    assert admission.snapshot()["active"] == 1
+    assert admission.depth == 0
+    admission.release(later)
+    assert admission.snapshot()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_user_does_not_hold_up_others():
+    """Check that others are admitted at once while one user waits."""
+    admission = Admission(limit=50, user_limit=2)
+    tickets = [admission.enqueue("u1", "g1", "mention") for _ in range(3)]
+    assert [ticket.admitted for ticket in tickets] == [True, True, False]
+    assert admission.depth == 1
+
+    other = admission.enqueue("u2", "g2", "mention")
+    direct = admission.enqueue("u3", None, "dm")
+    assert other.admitted and direct.admitted
+
+    admission.release(tickets[0])
+    assert tickets[2].admitted
+    assert admission.depth == 0
@@ -0,0 +1,50 @@
+"""Test that failed tool calls are not cached."""
+
+import json
+
+import pytest
+from aiohttp import web
+
+from mila import config
+from mila.tools import TOOLS
+from mila.tools.client import HTTP
+
+
+@pytest.mark.asyncio
+async def test_http_error_is_not_cached(monkeypatch):
+    """Check that a rate-limited answer is retried, not served again."""
+    statuses = [429, 200]
+
+    async def horoscope(_request: web.Request) -> web.Response:
+        """Answer with the next status in line."""
+        status = statuses.pop(0)
+        return web.json_response(
+            {
+                "data": {
+                    "date": "Jan 1, 2024",
+                    "horoscope_data": f"Answered with {status}.",
+                }
+            },
+            status=status,
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/v1/get-horoscope/daily", horoscope)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    _, port = runner.addresses[0]
+    monkeypatch.setattr(config, "HOROSCOPE_URL", f"http://127.0.0.1:{port}")
+    get_horoscope = TOOLS.get("get_horoscope")
+    try:
+        with pytest.raises(RuntimeError, match="429"):
+            await get_horoscope("virgo")
+        first = await get_horoscope("virgo")
+        second = await get_horoscope("virgo")
+    finally:
+        await HTTP.close()
+        await runner.cleanup()
+
+    assert json.loads(first)["horoscope"] == "Answered with 200."
+    assert second == first
+    assert not statuses
@@ -0,0 +1,95 @@
+"""Test the splitting and paced delivery of Discord messages."""
+
+import asyncio
+
+import pytest
+
+from mila import config
+from mila.delivery import CONTINUED, FENCE, Outbox, chunk
+
+LIMIT = 2000
+
+
+def test_short_text_is_one_chunk():
+    """Check that text within the limit is left alone."""
+    assert chunk("Hello.", LIMIT) == ["Hello."]
+
+
+def test_over_long_line_is_hard_split():
+    """Check that a line longer than any chunk is cut to fit."""
+    chunks = chunk("a" * 5000, LIMIT)
+    assert len(chunks) == 3
+    assert all(len(part) <= LIMIT for part in chunks)
+    assert "".join(part.removeprefix(f"{CONTINUED}\n") for part in chunks) == (
+        "a" * 5000
+    )
+
+
+def test_over_long_fence_line_terminates():
+    """Check that a huge opening fence line is not carried over whole."""
+    chunks = chunk(f"{FENCE}{'a' * 1985}\n{'b' * 3000}", LIMIT)
+    assert all(len(part) <= LIMIT for part in chunks)
+    assert chunks[0].endswith(f"\n{FENCE}")
+    for part in chunks[1:]:
+        assert part.startswith(f"{CONTINUED}\n{FENCE}\n")
+
+
+def test_tiny_limit_terminates():
+    """Check that a limit too small for the headers still makes progress."""
+    assert chunk(f"{FENCE}python\n{'x' * 50}", 5)
+
+
+def test_block_is_reopened_with_its_language():
+    """Check that a block cut between chunks is closed and reopened."""
+    body = "\n".join("x = 1" for _ in range(1000))
+    chunks = chunk(f"{FENCE}python\n{body}\n{FENCE}\nafter", LIMIT)
+    assert len(chunks) > 1
+    assert all(len(part) <= LIMIT for part in chunks)
+    for part in chunks[:-1]:
+        assert part.endswith(f"\n{FENCE}")
+    for part in chunks[1:]:
+        assert part.startswith(f"{CONTINUED}\n{FENCE}python\n")
+    assert chunks[-1].endswith(f"{FENCE}\nafter")
+
+
+def test_one_line_block_opens_nothing():
+    """Check that a block opened and closed on one line is plain text."""
+    chunks = chunk(f"{FENCE}x = 1{FENCE}\n" + "line of text\n" * 300, LIMIT)
+    assert len(chunks) == 2
+    assert not chunks[0].endswith(f"\n{FENCE}")
+    assert chunks[1].startswith(f"{CONTINUED}\nline of text")
+
+
+def test_over_long_closing_fence_line_fits():
+    """Check that a huge line closing a block is split within the limit."""
+    chunks = chunk(
+        f"{FENCE}py\nx=1\n{FENCE}{'z' * 2100}", config.MESSAGE_LIMIT
+    )
+    assert all(len(part) <= config.MESSAGE_LIMIT for part in chunks)
+    assert not chunks[1].endswith(f"\n{FENCE}")
+
+
+def test_over_long_opening_fence_line_is_closed():
+    """Check that chunks cut from an opening line close their block."""
+    chunks = chunk(f"{FENCE}{'a' * 4500}\nx=1\n{FENCE}", config.MESSAGE_LIMIT)
+    assert all(len(part) <= config.MESSAGE_LIMIT for part in chunks)
+    for part in chunks:
+        assert part.count(FENCE) % 2 == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_channels_are_forgotten():
+    """Check that pacing state is dropped once channels go quiet."""
+    outbox = Outbox(rate=5, window=0.05)
+
+    async def call(_previous):
+        """Stand in for a Discord API call."""
+        return "sent"
+
+    results = await asyncio.gather(
+        *(outbox.send(channel, [call]) for channel in range(100))
+    )
+    assert results == ["sent"] * 100
+    assert outbox.snapshot()["paced"] == 100
+    await asyncio.sleep(0.1)
+    assert outbox.snapshot()["paced"] == 0
@@ -0,0 +1,38 @@
+"""Test log sampling."""
+
+import logging
+import time
+
+from mila.logging import Sampler
+
+
+def _record(name: str, level: int, message: str) -> logging.LogRecord:
+    """Make a log record."""
+    return logging.LogRecord(name, level, __file__, 1, message, (), None)
+
+
+def _passed(sampler: Sampler, name: str, level: int, count: int) -> int:
+    """Count how many of several identical records pass."""
+    return sum(
+        sampler.filter(_record(name, level, "Run %s is %s."))
+        for _ in range(count)
+    )
+
+
+def test_only_configured_loggers_are_sampled():
+    """Check that routine messages elsewhere are never dropped."""
+    sampler = Sampler({"Mila.runs": logging.DEBUG}, rate=3, window=60)
+    assert _passed(sampler, "Mila.runs", logging.DEBUG, 10) == 3
+    assert _passed(sampler, "Mila.runs", logging.INFO, 10) == 10
+    assert _passed(sampler, "Mila.bot", logging.DEBUG, 10) == 10
+    assert _passed(sampler, "discord", logging.INFO, 10) == 10
+
+
+def test_drops_are_reported():
+    """Check that the next sampled message counts those dropped."""
+    sampler = Sampler({"Mila.runs": logging.DEBUG}, rate=1, window=0.05)
+    assert _passed(sampler, "Mila.runs", logging.DEBUG, 3) == 1
+    time.sleep(0.06)
+    record = _record("Mila.runs", logging.DEBUG, "Run %s is %s.")
+    assert sampler.filter(record)
+    assert record.msg.endswith("[2 similar suppressed]")
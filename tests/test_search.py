@@ -0,0 +1,67 @@
+"""Test that searching the web leaves the event loop free."""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from mila import config
+from mila.tools.client import HTTP
+from mila.tools.info import search_duckduckgo
+
+DELAY = 0.5  # How long the slow search engine takes to answer, in seconds.
+TICK = 0.01  # How often the ticker ticks, in seconds.
+
+
+async def _slow_search(request: web.Request) -> web.Response:
+    """Answer a search, slowly."""
+    await asyncio.sleep(DELAY)
+    return web.json_response(
+        {
+            "organic_results": [
+                {
+                    "title": f"Result for {request.query['q']}",
+                    "link": "https://example.com/",
+                    "snippet": "A snippet of the result.",
+                }
+            ]
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_search_does_not_block(monkeypatch):
+    """Check that other coroutines run while a slow search is pending."""
+    app = web.Application()
+    app.router.add_get("/search", _slow_search)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    _, port = runner.addresses[0]
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.setattr(
+        config, "SEARCH_URL", f"http://127.0.0.1:{port}/search"
+    )
+
+    ticks = 0
+
+    async def ticker() -> None:
+        """Count ticks until cancelled."""
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(TICK)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        results = await search_duckduckgo("mila")
+    finally:
+        ticking.cancel()
+        await HTTP.close()
+        await runner.cleanup()
+
+    assert json.loads(results)[0]["title"] == "Result for mila"
+    # A blocking search would have frozen the ticker for the whole delay.
+    assert ticks >= DELAY / TICK / 2
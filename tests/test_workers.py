@@ -0,0 +1,26 @@
+"""Test the worker pool for CPU-bound tool work."""
+
+import concurrent.futures
+import os
+
+import pytest
+
+from mila.tools.workers import Workers
+
+
+def _crash() -> None:
+    """Kill the worker process running this."""
+    os._exit(1)
+
+
+@pytest.mark.asyncio
+async def test_pool_recovers_from_a_dead_worker():
+    """Check that a dead worker does not break every later call."""
+    workers = Workers(1)
+    try:
+        assert await workers.run(abs, -1) == 1
+        with pytest.raises(concurrent.futures.process.BrokenProcessPool):
+            await workers.run(_crash)
+        assert await workers.run(abs, -2) == 2
+    finally:
+        workers.shutdown()